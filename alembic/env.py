@@ -1,5 +1,6 @@
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
 from alembic import context
 from app.core.config import settings
 from app.db.session import Base
@@ -21,12 +22,15 @@ def run_migrations_offline():
         context.run_migrations()
 
 def run_migrations_online():
-    configuration = {"sqlalchemy.url": settings.database_url}
-    connectable = engine_from_config(configuration, prefix="sqlalchemy.", poolclass=pool.NullPool)
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-        with context.begin_transaction():
-            context.run_migrations()
+    # Migrations need exactly one connection; build the engine directly from the URL
+    engine = create_engine(settings.database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            context.configure(connection=connection, target_metadata=target_metadata)
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
 
 if context.is_offline_mode():
     run_migrations_offline()
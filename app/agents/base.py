@@ -1,13 +1,17 @@
 from dataclasses import dataclass
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Mapping, Any
 from app.core.workflow import JobStage
 
-@dataclass
+# Shared read-only index for results that record no artifacts
+NO_ARTIFACTS: Mapping[str, Any] = MappingProxyType({})
+
+@dataclass(slots=True, frozen=True)
 class AgentResult:
     stage: JobStage
     ok: bool
     message: str
-    artifacts_index: Dict[str, Any]
+    artifacts_index: Mapping[str, Any]
 
 class BaseAgent:
     stage: JobStage
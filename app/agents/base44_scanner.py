@@ -1,178 +1,284 @@
 """
 Scanner utilities for detecting Base44 client usage patterns.
 """
+import bisect
+import hashlib
 import json
+import os
 import re
 import logging
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Iterable, Iterator, Optional, Tuple
 
 log = logging.getLogger(__name__)
 
 # Maximum file size to read (100KB)
 MAX_FILE_SIZE = 100 * 1024
 
+# In fast mode, stop once every usage flag is set and this many further
+# matching files added no new entity
+FAST_MODE_STABLE_FILES = 200
+
+# Most files submitted to the scan pool ahead of the one being merged
+SCAN_WINDOW = 64
+
+# File extensions to scan
+SCAN_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+
 # Directories to ignore
 IGNORE_DIRS = {"node_modules", ".next", "dist", "build", ".git", ".gitignore", ".venv", "venv", "__pycache__"}
 
+# base44Client usage patterns, compiled once at import time
+_BASE44_IMPORT_RE = re.compile(
+    r'import\s+(?:.*\s+from\s+)?["\']([^"\']*base44Client[^"\']*)["\']|'
+    r'from\s+["\']([^"\']*base44Client[^"\']*)["\']',
+    re.IGNORECASE
+)
+
+_ENTITIES_RE = re.compile(
+    r'base44\.entities\.(?P<entity>\w+)\.(list|get|create|update|patch|delete|replace|filter)',
+    re.IGNORECASE
+)
+
+_STORAGE_RE = re.compile(r'base44\.storage\.', re.IGNORECASE)
+
+_FUNCTIONS_RE = re.compile(r'base44\.functions\.', re.IGNORECASE)
+
+_LLM_RE = re.compile(r'base44\.(?:llm|ai|InvokeLLM)\.', re.IGNORECASE)
+
+# The patterns above fused into one alternation so each file is scanned in
+# a single pass. The matching branch is read from match.lastgroup. Files are
+# decoded as latin-1, so re.ASCII keeps \w and \s from matching the
+# codepoints that UTF-8 continuation bytes turn into.
+_COMBINED_RE = re.compile(
+    "|".join(f"(?P<{name}>{regex.pattern})" for name, regex in (
+        ("imp", _BASE44_IMPORT_RE),
+        ("ent", _ENTITIES_RE),
+        ("stor", _STORAGE_RE),
+        ("func", _FUNCTIONS_RE),
+        ("llm", _LLM_RE),
+    )),
+    re.IGNORECASE | re.ASCII
+)
 
-def should_ignore_path(path: Path) -> bool:
-    """Check if a path should be ignored."""
-    parts = path.parts
-    return any(part in IGNORE_DIRS for part in parts)
+
+def _newline_offsets(content: str) -> List[int]:
+    """Return the offsets of every newline in content."""
+    offsets = []
+    pos = content.find('\n')
+    while pos != -1:
+        offsets.append(pos)
+        pos = content.find('\n', pos + 1)
+    return offsets
+
+
+def _line_at(content: str, newline_offsets: List[int], line_num: int) -> str:
+    """Return 1-based line line_num of content without splitting the whole text."""
+    start = newline_offsets[line_num - 2] + 1 if line_num > 1 else 0
+    end = newline_offsets[line_num - 1] if line_num - 1 < len(newline_offsets) else len(content)
+    return content[start:end]
+
+
+def _read_file_bytes(path: str, size: int) -> bytes:
+    """Read a file using the size from its cached stat result as the read length."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        data = os.read(fd, size)
+        # The file may have grown since it was stat'ed
+        while True:
+            chunk = os.read(fd, 64 * 1024)
+            if not chunk:
+                return data
+            data += chunk
+    finally:
+        os.close(fd)
+
+
+def _scandir_recursive(path: str, ignore_dirs: set, exts: Tuple[str, ...]) -> Iterator[os.DirEntry]:
+    """
+    Yield file entries under path whose name ends with one of exts.
+    
+    Ignored directories are pruned before descending, so trees such as
+    node_modules are never listed. DirEntry caches its stat result, which
+    lets callers check file sizes without another syscall.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ignore_dirs:
+                        yield from _scandir_recursive(entry.path, ignore_dirs, exts)
+                elif entry.name.endswith(exts) and entry.is_file():
+                    yield entry
+    except OSError as e:
+        log.debug(f"Error listing directory {path}: {e}")
+
+
+def _scan_file(entry: os.DirEntry, source_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Scan a single file for base44Client usage.
+    
+    Has no shared state so files can be scanned concurrently. Returns None
+    when the file does not use base44Client.
+    """
+    try:
+        size = entry.stat().st_size
+        if size > MAX_FILE_SIZE:
+            return None
+        
+        file_path = Path(entry.path)
+        raw = _read_file_bytes(entry.path, size)
+        
+        # Every pattern contains "base44" (case-insensitive), so most files can
+        # be rejected with a substring check before decoding or running regexes
+        if b'base44' not in raw.lower():
+            return None
+        
+        # latin-1 maps bytes 1:1 to codepoints without validation; the patterns
+        # are ASCII, and only snippets need a real UTF-8 decode
+        content = raw.decode('latin-1')
+        if '\r' in content:
+            # Match read_text()'s universal newline handling for line numbers
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        rel_path = str(file_path.relative_to(source_dir)).replace('\\', '/')
+        
+        file_info = None
+        newline_offsets = None
+        
+        def ensure() -> Dict[str, Any]:
+            nonlocal file_info
+            if file_info is None:
+                file_info = {
+                    'file': rel_path,
+                    'imports': [],
+                    'entities': set(),
+                    'hasStorage': False,
+                    'hasFunctions': False,
+                    'hasLLM': False
+                }
+            return file_info
+        
+        for match in _COMBINED_RE.finditer(content):
+            tag = match.lastgroup
+            
+            if tag == 'imp':
+                # Line numbers are only needed for imports
+                if newline_offsets is None:
+                    newline_offsets = _newline_offsets(content)
+                line_num = bisect.bisect_left(newline_offsets, match.start()) + 1
+                line_content = _line_at(content, newline_offsets, line_num)
+                line_content = line_content.encode('latin-1').decode('utf-8', errors='ignore')
+                ensure()['imports'].append({
+                    'line': line_num,
+                    'snippet': line_content.strip()[:100]
+                })
+            elif tag == 'ent':
+                ensure()['entities'].add(match.group('entity'))
+            elif tag == 'stor':
+                ensure()['hasStorage'] = True
+            elif tag == 'func':
+                ensure()['hasFunctions'] = True
+            elif tag == 'llm':
+                ensure()['hasLLM'] = True
+        
+        return file_info
+        
+    except Exception as e:
+        log.debug(f"Error scanning file {entry.path}: {e}")
+        return None
+
+
+def _map_windowed(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Like executor.map, but pulls items lazily and keeps at most window calls
+    in flight. Results come back in input order. Closing the generator early
+    cancels the calls that have not started.
+    """
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
 
 
-def scan_base44_client_usage(source_dir: Path) -> Dict[str, Any]:
+def scan_base44_client_usage(source_dir: Path, fast_mode: bool = False) -> Dict[str, Any]:
     """
     Scan source repository for base44Client usage patterns.
     
+    Files are read and matched on a thread pool; results are merged here in
+    walk order so the output does not depend on scheduling.
+    
+    With fast_mode the scan stops once storage, functions and LLM usage have
+    all been seen and FAST_MODE_STABLE_FILES more matching files found no new
+    entity. clientFiles and importLocations are then incomplete, so callers
+    that need every location must leave it off.
+    
     Returns a dictionary with:
     - clientFiles: List of file paths where base44Client is used
     - usage: Dict with entities, storage, functions, llm usage
     - importLocations: List of import location details
     - notes: Additional notes
     """
-    client_files = []
+    client_files = set()
     import_locations = []
     entities_used = set()
     storage_used = False
     functions_used = False
     llm_used = False
+    files_since_new_entity = 0
+    stopped_early = False
     
-    # Patterns to search for
-    base44_import_pattern = re.compile(
-        r'import\s+(?:.*\s+from\s+)?["\']([^"\']*base44Client[^"\']*)["\']|'
-        r'from\s+["\']([^"\']*base44Client[^"\']*)["\']',
-        re.IGNORECASE
-    )
-    
-    entities_pattern = re.compile(
-        r'base44\.entities\.(\w+)\.(list|get|create|update|patch|delete|replace|filter)',
-        re.IGNORECASE
-    )
-    
-    storage_pattern = re.compile(
-        r'base44\.storage\.',
-        re.IGNORECASE
-    )
-    
-    functions_pattern = re.compile(
-        r'base44\.functions\.',
-        re.IGNORECASE
-    )
-    
-    llm_pattern = re.compile(
-        r'base44\.(?:llm|ai|InvokeLLM)\.',
-        re.IGNORECASE
-    )
-    
-    # File extensions to scan
-    extensions = {'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs'}
-    
-    def scan_file(file_path: Path) -> Optional[Dict[str, Any]]:
-        """Scan a single file for base44Client usage."""
-        try:
-            if file_path.stat().st_size > MAX_FILE_SIZE:
-                return None
-            
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            rel_path = str(file_path.relative_to(source_dir)).replace('\\', '/')
-            
-            file_info = None
-            
-            # Check for imports
-            import_matches = list(base44_import_pattern.finditer(content))
-            if import_matches:
-                lines = content.split('\n')
-                for match in import_matches:
-                    line_num = content[:match.start()].count('\n') + 1
-                    line_content = lines[line_num - 1] if line_num <= len(lines) else ''
-                    
-                    if not file_info:
-                        file_info = {
-                            'file': rel_path,
-                            'imports': [],
-                            'entities': set(),
-                            'hasStorage': False,
-                            'hasFunctions': False,
-                            'hasLLM': False
-                        }
-                        client_files.append(rel_path)
-                    
-                    file_info['imports'].append({
-                        'line': line_num,
-                        'snippet': line_content.strip()[:100]
-                    })
-                    
-                    import_locations.append({
-                        'file': rel_path,
-                        'lineRange': f"{line_num}-{line_num}",
-                        'snippetHint': line_content.strip()[:100]
-                    })
-            
-            # Check for entity usage
-            entity_matches = list(entities_pattern.finditer(content))
-            if entity_matches:
-                if not file_info:
-                    file_info = {
-                        'file': rel_path,
-                        'imports': [],
-                        'entities': set(),
-                        'hasStorage': False,
-                        'hasFunctions': False,
-                        'hasLLM': False
-                    }
-                    client_files.append(rel_path)
-                
-                for match in entity_matches:
-                    entity_name = match.group(1)
-                    entities_used.add(entity_name)
-                    file_info['entities'].add(entity_name)
+    # Walk through source directory
+    scanned_files = []
+    entries = _scandir_recursive(str(source_dir), IGNORE_DIRS, SCAN_EXTENSIONS)
+    with ThreadPoolExecutor() as executor:
+        scan = partial(_scan_file, source_dir=source_dir)
+        for file_info in _map_windowed(executor, scan, entries, SCAN_WINDOW):
+            if not file_info:
+                continue
             
-            # Check for storage usage
-            if storage_pattern.search(content):
-                storage_used = True
-                if file_info:
-                    file_info['hasStorage'] = True
-                elif rel_path not in client_files:
-                    client_files.append(rel_path)
+            rel_path = file_info['file']
+            client_files.add(rel_path)
             
-            # Check for functions usage
-            if functions_pattern.search(content):
-                functions_used = True
-                if file_info:
-                    file_info['hasFunctions'] = True
-                elif rel_path not in client_files:
-                    client_files.append(rel_path)
+            for imp in file_info['imports']:
+                import_locations.append({
+                    'file': rel_path,
+                    'lineRange': f"{imp['line']}-{imp['line']}",
+                    'snippetHint': imp['snippet']
+                })
             
-            # Check for LLM usage
-            if llm_pattern.search(content):
-                llm_used = True
-                if file_info:
-                    file_info['hasLLM'] = True
-                elif rel_path not in client_files:
-                    client_files.append(rel_path)
+            entity_count = len(entities_used)
+            entities_used.update(file_info['entities'])
+            storage_used = storage_used or file_info['hasStorage']
+            functions_used = functions_used or file_info['hasFunctions']
+            llm_used = llm_used or file_info['hasLLM']
             
-            return file_info
+            # Only files importing base44Client or calling entities count as scanned
+            if file_info['imports'] or file_info['entities']:
+                scanned_files.append(file_info)
             
-        except Exception as e:
-            log.debug(f"Error scanning file {file_path}: {e}")
-            return None
-    
-    # Walk through source directory
-    scanned_files = []
-    for file_path in source_dir.rglob('*'):
-        if file_path.is_file() and file_path.suffix in extensions:
-            if should_ignore_path(file_path):
-                continue
+            if len(entities_used) > entity_count:
+                files_since_new_entity = 0
+            else:
+                files_since_new_entity += 1
             
-            file_info = scan_file(file_path)
-            if file_info:
-                scanned_files.append(file_info)
+            if (fast_mode and storage_used and functions_used and llm_used
+                    and files_since_new_entity > FAST_MODE_STABLE_FILES):
+                stopped_early = True
+                break
     
     # Build result
     result = {
-        'clientFiles': sorted(list(set(client_files))),
+        'clientFiles': sorted(client_files),
         'usage': {
             'entities': sorted(list(entities_used)),
             'storage': storage_used,
@@ -188,6 +294,36 @@ def scan_base44_client_usage(source_dir: Path) -> Dict[str, Any]:
             f"LLM API used: {llm_used}"
         ]
     }
+    if stopped_early:
+        result['notes'].append("Scan stopped early (fast mode); file lists are partial")
     
     return result
 
+
+
+@lru_cache(maxsize=1)
+def _scanner_fingerprint() -> bytes:
+    """Hash of this module's source, so scanner changes invalidate cached scans."""
+    return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).digest()
+
+
+def source_fingerprint(source_dir: Path) -> str:
+    """
+    Digest of the files scan_base44_client_usage would read, and of the scanner itself.
+    
+    Hashes each scanned file's relative path, size and mtime without reading
+    contents, so it costs one stat per file (already cached by scandir) and
+    changes whenever a scan could produce a different result.
+    """
+    root = str(source_dir)
+    records = []
+    for entry in _scandir_recursive(root, IGNORE_DIRS, SCAN_EXTENSIONS):
+        st = entry.stat()
+        records.append(f"{os.path.relpath(entry.path, root)}\0{st.st_size}\0{st.st_mtime_ns}")
+    
+    # Directory listing order is not guaranteed, so hash in sorted order
+    h = hashlib.blake2b(digest_size=20)
+    h.update(_scanner_fingerprint())
+    for record in sorted(records):
+        h.update(record.encode('utf-8', 'surrogateescape') + b'\n')
+    return h.hexdigest()
@@ -4,16 +4,35 @@ import re
 import shutil
 import logging
 from pathlib import Path
-from typing import List
-from git import Repo
-import asyncio
-from app.agents.base import BaseAgent, AgentResult
+from typing import Dict, List
+from git import Git, Repo
+from app.agents.base import BaseAgent, AgentResult, NO_ARTIFACTS
+from app.core.artifacts import has_entries
 from app.core.workflow import JobStage
 from app.core.config import settings
 from app.core.github import GitHubClient
 
 log = logging.getLogger(__name__)
 
+# GitHub repo URL formats:
+# https://github.com/owner/repo.git
+# https://github.com/owner/repo
+# git@github.com:owner/repo.git
+_REPO_URL_RE = re.compile(r"(?:https?://github\.com/|git@github\.com:)([^/]+)/([^/]+?)(?:\.git)?$")
+
+# Default branch per target repo URL, so retries in the same process skip the lookup
+_DEFAULT_BRANCH_CACHE: Dict[str, str] = {}
+
+
+def _link_or_copy(src, dst) -> None:
+    """Hard-link src to dst, falling back to a copy across filesystems."""
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
 
 class GitCommitAgent(BaseAgent):
     stage = JobStage.CREATE_PR
@@ -33,24 +52,42 @@ class GitCommitAgent(BaseAgent):
                     self.stage,
                     False,
                     f"Generated backend directory not found: {generated_backend_dir}",
-                    {}
+                    NO_ARTIFACTS
                 )
 
             # Clone target repo
             repo_was_empty = False
-            if target_repo_dir.exists() and any(target_repo_dir.iterdir()):
+            if has_entries(target_repo_dir):
                 log.info(f"Target repo already exists at {target_repo_dir}, reusing it")
                 repo = Repo(target_repo_dir)
             else:
-                log.info(f"Cloning target repo {job.target_repo_url} to {target_repo_dir}")
+                # Probe the remote without a working tree: an empty repo has no HEAD
+                remote_branch = None
                 try:
-                    repo = Repo.clone_from(job.target_repo_url, target_repo_dir, depth=1)
+                    remote_branch = self._ls_remote_default_branch(Git(), job.target_repo_url)
+                    repo_was_empty = remote_branch is None
                 except Exception as e:
-                    # If clone fails (e.g., empty repo), initialize a new repo
-                    log.warning(f"Clone failed (may be empty repo): {e}, initializing new repo")
+                    log.warning(f"Could not query remote {job.target_repo_url}: {e}")
+                if remote_branch:
+                    _DEFAULT_BRANCH_CACHE[job.target_repo_url] = remote_branch
+
+                if not repo_was_empty:
+                    log.info(f"Cloning target repo {job.target_repo_url} to {target_repo_dir}")
+                    # Only the tip of the default branch is needed; blobs are fetched on checkout
+                    clone_options = ["--depth=1", "--filter=blob:none", "--single-branch"]
+                    if remote_branch:
+                        clone_options += ["--branch", remote_branch]
+                    try:
+                        repo = Repo.clone_from(job.target_repo_url, target_repo_dir, multi_options=clone_options)
+                    except Exception as e:
+                        # If clone fails (e.g., empty repo), initialize a new repo
+                        log.warning(f"Clone failed (may be empty repo): {e}, initializing new repo")
+                        repo_was_empty = True
+                else:
+                    log.info(f"Target repo {job.target_repo_url} is empty, skipping clone")
+                if repo_was_empty:
                     repo = Repo.init(target_repo_dir)
                     repo.create_remote("origin", job.target_repo_url)
-                    repo_was_empty = True
 
             # Determine default branch
             base_branch = self._get_base_branch(repo, job.target_repo_url)
@@ -103,7 +140,8 @@ class GitCommitAgent(BaseAgent):
                 log.info(f"Removing existing backend directory: {backend_dest}")
                 shutil.rmtree(backend_dest)
             log.info(f"Copying backend from {generated_backend_dir} to {backend_dest}")
-            shutil.copytree(generated_backend_dir, backend_dest)
+            # Hard links avoid copying file contents while keeping the workspace intact for retries
+            shutil.copytree(generated_backend_dir, backend_dest, copy_function=_link_or_copy)
             copied_files.append(f"backend/ (entire directory)")
 
             # Copy artifacts
@@ -122,18 +160,19 @@ class GitCommitAgent(BaseAgent):
                 src_path = artifacts_dir / artifact_file
                 if src_path.exists():
                     dest_path = artifacts_dest_dir / artifact_file
-                    shutil.copy2(src_path, dest_path)
+                    _link_or_copy(src_path, dest_path)
                     copied_files.append(f"migrator-artifacts/{job.id}/{artifact_file}")
                     log.info(f"Copied {artifact_file} to {dest_path}")
                 else:
                     log.warning(f"Artifact file not found: {src_path}")
 
-            # Stage all changes
-            repo.git.add(all=True)
+            # Stage only the paths this agent wrote; --all also records deletions under them
+            repo.git.add("--all", "--", "backend", f"migrator-artifacts/{job.id}")
 
-            # Commit
+            # Commit if the index differs from HEAD; only staged paths matter, so the
+            # working tree does not need to be rescanned
             commit_message = f"chore: add generated backend for {job.id}"
-            if repo.is_dirty(untracked_files=True):
+            if repo.index.diff("HEAD"):
                 repo.index.commit(commit_message)
                 commit_hash = repo.head.commit.hexsha
                 log.info(f"Committed changes with hash: {commit_hash}")
@@ -163,7 +202,7 @@ class GitCommitAgent(BaseAgent):
                     self.stage,
                     False,
                     f"Failed to push branch: {push_error}",
-                    {}
+                    NO_ARTIFACTS
                 )
 
             # Get PR URL (if created)
@@ -171,7 +210,7 @@ class GitCommitAgent(BaseAgent):
             github_token = self._get_github_token()
             
             if github_token:
-                pr_url = asyncio.run(self._create_pr(
+                pr_url = self._create_pr(
                     github_token=github_token,
                     repo_url=job.target_repo_url,
                     base_branch=base_branch,
@@ -179,7 +218,7 @@ class GitCommitAgent(BaseAgent):
                     job_id=job.id,
                     source_repo_url=job.source_repo_url,
                     db_stack=job.db_stack,
-                ))
+                )
                 if pr_url:
                     log.info(f"Created PR: {pr_url}")
 
@@ -200,7 +239,7 @@ class GitCommitAgent(BaseAgent):
 
             # Also copy gitops.md to artifacts in target repo
             artifacts_gitops_dest = artifacts_dest_dir / "gitops.md"
-            shutil.copy2(gitops_md_path, artifacts_gitops_dest)
+            _link_or_copy(gitops_md_path, artifacts_gitops_dest)
             copied_files.append(f"migrator-artifacts/{job.id}/gitops.md")
 
             return AgentResult(
@@ -222,18 +261,30 @@ class GitCommitAgent(BaseAgent):
                 self.stage,
                 False,
                 f"GitCommitAgent failed: {e}",
-                {}
+                NO_ARTIFACTS
             )
 
     def _get_base_branch(self, repo: Repo, repo_url: str) -> str:
         """Determine the default branch, defaulting to 'main'."""
+        cached = _DEFAULT_BRANCH_CACHE.get(repo_url)
+        if cached:
+            return cached
         try:
-            # Try to get the default branch from remote
-            remote = repo.remotes.origin
-            remote_refs = remote.fetch()
-            for ref in remote_refs:
-                if ref.remote_head == "main" or ref.remote_head == "master":
-                    return ref.remote_head
+            branch = None
+            # Ask the GitHub API first; it is a single small request
+            github_token = self._get_github_token()
+            if github_token:
+                try:
+                    owner, repo_name = self._parse_repo_url(repo_url)
+                    branch = GitHubClient(token=github_token).get_default_branch(owner, repo_name)
+                except Exception as e:
+                    log.warning(f"Could not get default branch from GitHub API: {e}")
+            # Fall back to the remote's symbolic HEAD, which transfers no objects
+            if not branch:
+                branch = self._ls_remote_default_branch(repo.git, "origin")
+            if branch:
+                _DEFAULT_BRANCH_CACHE[repo_url] = branch
+                return branch
             # Fallback to repo's active branch or main
             if repo.active_branch:
                 return repo.active_branch.name
@@ -242,6 +293,18 @@ class GitCommitAgent(BaseAgent):
             log.warning(f"Could not determine base branch, defaulting to main: {e}")
             return "main"
 
+    def _ls_remote_default_branch(self, git_cmd: Git, remote: str) -> str | None:
+        """Read the default branch from `git ls-remote --symref <remote> HEAD`.
+
+        Returns None when the remote has no HEAD, i.e. it has no commits yet.
+        """
+        output = git_cmd.ls_remote("--symref", remote, "HEAD")
+        # Expected line: "ref: refs/heads/<name>\tHEAD"
+        for line in output.splitlines():
+            if line.startswith("ref: refs/heads/") and line.endswith("HEAD"):
+                return line[len("ref: refs/heads/"):].split()[0]
+        return None
+
     def _get_github_token(self) -> str | None:
         """Get GitHub token from environment variable or settings."""
         # Check GH_TOKEN environment variable first (as per requirements)
@@ -255,7 +318,7 @@ class GitCommitAgent(BaseAgent):
         # Fallback to settings.github_token
         return settings.github_token
 
-    async def _create_pr(
+    def _create_pr(
         self,
         github_token: str,
         repo_url: str,
@@ -280,7 +343,7 @@ class GitCommitAgent(BaseAgent):
                 job_id=job_id,
             )
             
-            pr_data = await client.create_pr(
+            pr_data = client.create_pr_sync(
                 owner=owner,
                 repo=repo_name,
                 head=head_branch,
@@ -297,12 +360,7 @@ class GitCommitAgent(BaseAgent):
 
     def _parse_repo_url(self, repo_url: str) -> tuple[str, str]:
         """Parse GitHub repo URL to extract owner and repo name."""
-        # Handle formats like:
-        # https://github.com/owner/repo.git
-        # https://github.com/owner/repo
-        # git@github.com:owner/repo.git
-        pattern = r"(?:https?://github\.com/|git@github\.com:)([^/]+)/([^/]+?)(?:\.git)?$"
-        match = re.match(pattern, repo_url)
+        match = _REPO_URL_RE.match(repo_url)
         if match:
             owner = match.group(1)
             repo_name = match.group(2)
@@ -1,8 +1,29 @@
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from app.agents.base import BaseAgent, AgentResult
+from app.agents.base import BaseAgent, AgentResult, NO_ARTIFACTS
 from app.core.workflow import JobStage
+from app.core.artifacts import artifact_status, workspace_rel
+from app.generators import backend_gen
 from app.generators.backend_gen import generate_backend
 
+@lru_cache(maxsize=1)
+def _generator_fingerprint() -> bytes:
+    """Hash of the backend generator sources, so generator changes invalidate cached output."""
+    h = hashlib.blake2b()
+    for src in sorted(Path(backend_gen.__file__).parent.glob("*.py")):
+        h.update(src.read_bytes())
+    return h.digest()
+
+def _backend_cache_key(job_id, ui_contract_path: Path, storage_plan_path: Path) -> str:
+    """Content hash of everything generate_backend's output depends on."""
+    h = hashlib.blake2b(_generator_fingerprint())
+    for part in (str(job_id).encode("utf-8"), ui_contract_path.read_bytes(), storage_plan_path.read_bytes()):
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
 class BackendBuilderAgent(BaseAgent):
     stage = JobStage.GENERATE_BACKEND
     def run(self, job, ws):
@@ -11,26 +32,41 @@ class BackendBuilderAgent(BaseAgent):
         storage_plan_path = ws.artifacts_dir / "storage-plan.json"
         
         # Check that required artifacts exist
-        if not ui_contract_path.exists():
+        artifacts = artifact_status(ws)
+        if "ui-contract.json" not in artifacts:
             return AgentResult(
                 self.stage,
                 False,
                 "ui-contract.json not found in workspace artifacts",
-                {}
+                NO_ARTIFACTS
             )
         
-        if not storage_plan_path.exists():
+        if "storage-plan.json" not in artifacts:
             return AgentResult(
                 self.stage,
                 False,
                 "storage-plan.json not found in workspace artifacts",
-                {}
+                NO_ARTIFACTS
             )
         
         # Set output directory for generated backend
         out_dir = ws.root / "generated" / "backend"
+        # Kept outside out_dir so it is never copied into the target repo
+        cache_path = out_dir.parent / "backend.gen-cache"
         
         try:
+            # Skip regeneration when inputs and generator are unchanged
+            cache_key = _backend_cache_key(job.id, ui_contract_path, storage_plan_path)
+            if out_dir.is_dir() and cache_path.exists() and cache_path.read_text(encoding="utf-8") == cache_key:
+                file_count = sum(1 for p in out_dir.rglob("*") if p.is_file())
+                return AgentResult(
+                    self.stage,
+                    True,
+                    f"Backend inputs unchanged, reused {file_count} generated files",
+                    {"backend_dir": workspace_rel(ws, out_dir)}
+                )
+            cache_path.unlink(missing_ok=True)
+            
             # Generate backend skeleton
             generated_files = generate_backend(
                 job_id=job.id,
@@ -38,52 +74,90 @@ class BackendBuilderAgent(BaseAgent):
                 storage_plan_path=storage_plan_path,
                 out_dir=out_dir,
             )
+            cache_path.write_text(cache_key, encoding="utf-8")
             
             return AgentResult(
                 self.stage,
                 True,
                 f"Generated {len(generated_files)} backend files",
-                {"backend_dir": str(out_dir.relative_to(ws.root))}
+                {"backend_dir": workspace_rel(ws, out_dir)}
             )
         except Exception as e:
             return AgentResult(
                 self.stage,
                 False,
                 f"Backend generation failed: {e}",
-                {}
+                NO_ARTIFACTS
             )
 
-class AsyncArchitectAgent(BaseAgent):
+@dataclass(frozen=True)
+class PlaceholderMarker:
+    stage: JobStage
+    dir_attr: str  # workspace attribute holding the output directory
+    file_name: str
+    content: bytes  # written as-is, no per-run encoding
+    artifact_key: str
+    message: str
+
+# Markers written for stages that are not implemented yet
+PLACEHOLDER_MARKERS = (
+    PlaceholderMarker(
+        JobStage.ADD_ASYNC,
+        "target_dir",
+        "MIGRATION_ASYNC_TODO.md",
+        b"# Async architecture TODO\n\n"
+        b"Add queue + worker (Redis) pattern for long-running tasks.\n",
+        "async_marker",
+        "Created async TODO marker",
+    ),
+    PlaceholderMarker(
+        JobStage.WIRE_FRONTEND,
+        "target_dir",
+        "MIGRATION_WIRING_TODO.md",
+        b"# Frontend wiring TODO\n\n"
+        b"Update ONLY api client wrapper + env vars to point to backend.\n",
+        "wiring_marker",
+        "Created wiring TODO marker",
+    ),
+    PlaceholderMarker(
+        JobStage.VERIFY,
+        "artifacts_dir",
+        "verification.md",
+        b"# Verification (placeholder)\n\n"
+        b"- TODO: run docker compose for migrated app\n"
+        b"- TODO: smoke test endpoints\n"
+        b"- TODO: optional Playwright UI smoke tests\n",
+        "verification",
+        "Wrote placeholder verification report",
+    ),
+)
+
+def _write_marker(ws, marker: PlaceholderMarker) -> str:
+    """Write a placeholder marker and return its artifact reference."""
+    path = Path(getattr(ws, marker.dir_attr)) / marker.file_name
+    path.write_bytes(marker.content)
+    if marker.dir_attr == "target_dir":
+        return f"target/{marker.file_name}"
+    return workspace_rel(ws, path)
+
+class PlaceholderMarkersAgent(BaseAgent):
+    """Writes every placeholder marker in one stage instead of one stage each."""
     stage = JobStage.ADD_ASYNC
     def run(self, job, ws):
-        marker = Path(ws.target_dir) / "MIGRATION_ASYNC_TODO.md"
-        marker.write_text(
-            "# Async architecture TODO\n\n"
-            "Add queue + worker (Redis) pattern for long-running tasks.\n",
-            encoding="utf-8"
-        )
-        return AgentResult(self.stage, True, "Created async TODO marker", {"async_marker": "target/MIGRATION_ASYNC_TODO.md"})
+        artifacts = {m.artifact_key: _write_marker(ws, m) for m in PLACEHOLDER_MARKERS}
+        stages = ", ".join(m.stage.value for m in PLACEHOLDER_MARKERS)
+        return AgentResult(self.stage, True, f"Created placeholder markers for {stages}", artifacts)
 
-class FrontendWiringAgent(BaseAgent):
-    stage = JobStage.WIRE_FRONTEND
+class _SingleMarkerAgent(BaseAgent):
     def run(self, job, ws):
-        marker = Path(ws.target_dir) / "MIGRATION_WIRING_TODO.md"
-        marker.write_text(
-            "# Frontend wiring TODO\n\n"
-            "Update ONLY api client wrapper + env vars to point to backend.\n",
-            encoding="utf-8"
-        )
-        return AgentResult(self.stage, True, "Created wiring TODO marker", {"wiring_marker": "target/MIGRATION_WIRING_TODO.md"})
+        marker = next(m for m in PLACEHOLDER_MARKERS if m.stage == self.stage)
+        return AgentResult(self.stage, True, marker.message, {marker.artifact_key: _write_marker(ws, marker)})
+
+class AsyncArchitectAgent(_SingleMarkerAgent):
+    stage = JobStage.ADD_ASYNC
 
-class VerificationAgent(BaseAgent):
+class FrontendWiringAgent(_SingleMarkerAgent):
+    stage = JobStage.WIRE_FRONTEND
+
+class VerificationAgent(_SingleMarkerAgent):
     stage = JobStage.VERIFY
-    def run(self, job, ws):
-        report = Path(ws.artifacts_dir) / "verification.md"
-        report.write_text(
-            "# Verification (placeholder)\n\n"
-            "- TODO: run docker compose for migrated app\n"
-            "- TODO: smoke test endpoints\n"
-            "- TODO: optional Playwright UI smoke tests\n",
-            encoding="utf-8"
-        )
-        return AgentResult(self.stage, True, "Wrote placeholder verification report", {"verification": str(report.relative_to(ws.root))})
@@ -1,13 +1,14 @@
 """
 Base44ClientAdapterAgent - Generates compatibility client for Base44 API.
 """
-import json
 import logging
+import orjson
 from pathlib import Path
-from app.agents.base import BaseAgent, AgentResult
+from typing import Any, Dict, Tuple
+from app.agents.base import BaseAgent, AgentResult, NO_ARTIFACTS
 from app.core.workflow import JobStage
-from app.agents.base44_scanner import scan_base44_client_usage
-from app.generators.client_adapter_gen.generator import generate_base44_client_adapter
+from app.core.artifacts import artifact_status, load_json, workspace_rel, write_if_changed
+from app.agents.base44_scanner import scan_base44_client_usage, source_fingerprint
 
 log = logging.getLogger(__name__)
 
@@ -21,42 +22,38 @@ class Base44ClientAdapterAgent(BaseAgent):
             storage_plan_path = ws.artifacts_dir / "storage-plan.json"
             ui_contract_path = ws.artifacts_dir / "ui-contract.json"
             
-            if not storage_plan_path.exists():
+            artifacts = artifact_status(ws)
+            if "storage-plan.json" not in artifacts:
                 return AgentResult(
                     self.stage,
                     False,
                     "storage-plan.json not found in workspace artifacts",
-                    {}
+                    NO_ARTIFACTS
                 )
             
-            if not ui_contract_path.exists():
+            if "ui-contract.json" not in artifacts:
                 return AgentResult(
                     self.stage,
                     False,
                     "ui-contract.json not found in workspace artifacts",
-                    {}
+                    NO_ARTIFACTS
                 )
             
             # Load artifacts
-            with open(storage_plan_path, 'r', encoding='utf-8') as f:
-                storage_plan = json.load(f)
+            storage_plan = load_json(storage_plan_path)
+            ui_contract = load_json(ui_contract_path)
             
-            with open(ui_contract_path, 'r', encoding='utf-8') as f:
-                ui_contract = json.load(f)
-            
-            # Scan source for base44Client usage
-            log.info("Scanning source repository for base44Client usage...")
-            base44_usage = scan_base44_client_usage(ws.source_dir)
+            # Scan source for base44Client usage (reused when the source commit is unchanged)
+            base44_usage, usage_bytes = self._scan_source_usage(ws)
             
             # Write usage artifact
             usage_artifact_path = ws.artifacts_dir / "base44-client-usage.json"
-            usage_artifact_path.write_text(
-                json.dumps(base44_usage, indent=2),
-                encoding="utf-8"
-            )
+            write_if_changed(usage_artifact_path, usage_bytes)
             log.info(f"Generated base44-client-usage.json artifact")
             
-            # Generate compatibility client in target repo
+            # Generate compatibility client in target repo; imported here so
+            # workers that never reach this stage don't load the generator
+            from app.generators.client_adapter_gen.generator import generate_base44_client_adapter
             log.info("Generating Base44 compatibility client...")
             generated_files = generate_base44_client_adapter(
                 target_dir=ws.target_dir,
@@ -73,7 +70,7 @@ class Base44ClientAdapterAgent(BaseAgent):
                 True,
                 f"Generated Base44 compatibility client with {len(generated_files)} files",
                 {
-                    "base44_client_usage": str(usage_artifact_path.relative_to(ws.root)),
+                    "base44_client_usage": workspace_rel(ws, usage_artifact_path),
                     "generated_files": generated_files,
                 }
             )
@@ -84,6 +81,40 @@ class Base44ClientAdapterAgent(BaseAgent):
                 self.stage,
                 False,
                 f"Failed to generate Base44 compatibility client: {e}",
-                {}
+                NO_ARTIFACTS
             )
-
+    
+    def _scan_source_usage(self, ws) -> Tuple[Dict[str, Any], bytes]:
+        """
+        Return the base44Client usage scan of the source repo and its JSON bytes.
+        
+        Results are stored per source fingerprint (paths, sizes and mtimes of
+        the scanned files) as base44-client-usage.<fingerprint>.json, so a
+        rerun of this stage on an unchanged tree skips reading and matching.
+        Only the current fingerprint's file is kept, and a cache file that
+        cannot be read or parsed is ignored and rewritten by a fresh scan.
+        """
+        fingerprint = source_fingerprint(ws.source_dir)
+        cached_path = ws.artifacts_dir / f"base44-client-usage.{fingerprint}.json"
+        try:
+            usage_bytes = cached_path.read_bytes()
+            base44_usage = orjson.loads(usage_bytes)
+        except FileNotFoundError:
+            pass
+        except (orjson.JSONDecodeError, OSError) as e:
+            log.warning(f"Ignoring unreadable base44Client usage cache {cached_path.name}: {e}")
+        else:
+            log.info(f"Reusing base44Client usage scan for source fingerprint {fingerprint}")
+            return base44_usage, usage_bytes
+        
+        log.info("Scanning source repository for base44Client usage...")
+        # Serialized once to bytes; the same buffer is written to both files
+        base44_usage = scan_base44_client_usage(ws.source_dir)
+        usage_bytes = orjson.dumps(base44_usage, option=orjson.OPT_INDENT_2)
+        write_if_changed(cached_path, usage_bytes)
+        
+        # Scans for earlier source states can never be reused once the tree changed
+        for stale_path in ws.artifacts_dir.glob("base44-client-usage.*.json"):
+            if stale_path != cached_path:
+                stale_path.unlink(missing_ok=True)
+        return base44_usage, usage_bytes
@@ -1,28 +1,130 @@
 import logging
-from git import Repo
-from app.agents.base import BaseAgent, AgentResult
+import os
+import shutil
+import re
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from app.agents.base import BaseAgent, AgentResult, NO_ARTIFACTS
+from app.core.artifacts import has_entries
+from app.core.config import settings
 from app.core.workflow import JobStage
 
 log = logging.getLogger(__name__)
 
+# Binary assets no intake scanner reads; left out of the source checkout so
+# their blobs are never downloaded
+SOURCE_SPARSE_EXCLUDES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mov", "*.mp3", "*.wav",
+    "*.zip", "*.pdf",
+]
+
+def _git(*args, cwd=None) -> None:
+    """Run a git command, raising RuntimeError with git's stderr on failure."""
+    try:
+        subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr.decode("utf-8", errors="replace").strip() or str(e)) from e
+
+def _mirror_path(cache_dir, url) -> str:
+    """Location of the bare mirror for url: <cache_dir>/<host>/<owner>/<repo>.git."""
+    scp_like = re.match(r"^[^/@]+@([^:/]+):(.+)$", url)
+    if scp_like:
+        host, path = scp_like.groups()
+    else:
+        parts = urlsplit(url)
+        host, path = parts.hostname or "local", parts.path
+    segments = [re.sub(r"[^A-Za-z0-9._-]", "_", s) for s in path.split("/") if s not in ("", ".", "..")]
+    if segments:
+        segments[-1] = segments[-1].removesuffix(".git") + ".git"
+    return os.path.join(cache_dir, host, *segments)
+
+def _reference_mirror(url):
+    """
+    Create or refresh the shared bare mirror for url and return its path.
+
+    Returns None when no cache directory is configured or the mirror could not
+    be created; a mirror that exists but failed to refresh is still returned,
+    since stale objects are still useful as a reference.
+    """
+    if not settings.git_clone_cache_dir:
+        return None
+    mirror = _mirror_path(settings.git_clone_cache_dir, url)
+    if has_entries(mirror):
+        try:
+            _git("fetch", "--prune", "--quiet", cwd=mirror)
+        except Exception as e:
+            log.warning(f"Could not refresh clone cache {mirror}: {e}")
+        return mirror
+    # Build the mirror next to its final location and rename it into place, so
+    # concurrent jobs never reference a half-written mirror
+    tmp = f"{mirror}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        os.makedirs(os.path.dirname(mirror), exist_ok=True)
+        _git("clone", "--mirror", "--quiet", url, tmp)
+        os.rename(tmp, mirror)
+    except Exception as e:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if has_entries(mirror):
+            return mirror
+        log.warning(f"Could not create clone cache for {url}: {e}")
+        return None
+    return mirror
+
+def _clone_if_missing(url, dest, sparse_excludes=None) -> bool:
+    """Clone url into dest unless it already has content. Returns True if cloned."""
+    if has_entries(dest):
+        return False
+    try:
+        # Blobless: only blobs that end up in the checkout are fetched
+        options = ["--depth=1", "--filter=blob:none", "--single-branch"]
+        if sparse_excludes:
+            options.append("--no-checkout")
+        mirror = _reference_mirror(url)
+        if mirror:
+            # Objects already in the local mirror are copied instead of fetched;
+            # --dissociate keeps the workspace usable if the mirror is pruned later
+            options += [f"--reference-if-able={mirror}", "--dissociate"]
+        _git("clone", *options, url, str(dest))
+        if sparse_excludes:
+            _git("sparse-checkout", "set", "--no-cone", "/*", *(f"!{p}" for p in sparse_excludes), cwd=dest)
+            _git("checkout", cwd=dest)
+    except Exception:
+        # Don't leave a partial checkout that would look "already present" later
+        shutil.rmtree(dest, ignore_errors=True)
+        raise
+    return True
+
 class CloneSourceAgent(BaseAgent):
     stage = JobStage.CLONE_SOURCE
     def run(self, job, ws):
         try:
-            if ws.source_dir.exists() and any(ws.source_dir.iterdir()):
-                return AgentResult(self.stage, True, "Source already present", {"source_dir": str(ws.source_dir)})
-            Repo.clone_from(job.source_repo_url, ws.source_dir, depth=1)
+            # Clone the target alongside the source so the two network-bound
+            # clones overlap; CloneTargetAgent then finds it already present
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                target_future = executor.submit(_clone_if_missing, job.target_repo_url, ws.target_dir)
+                source_future = executor.submit(
+                    _clone_if_missing, job.source_repo_url, ws.source_dir, SOURCE_SPARSE_EXCLUDES
+                )
+                try:
+                    target_future.result()
+                except Exception as e:
+                    log.warning(f"Early target clone failed, CLONE_TARGET will retry: {e}")
+                if not source_future.result():
+                    return AgentResult(self.stage, True, "Source already present", {"source_dir": str(ws.source_dir)})
             return AgentResult(self.stage, True, "Cloned source repo", {"source_dir": str(ws.source_dir)})
         except Exception as e:
-            return AgentResult(self.stage, False, f"Failed to clone source repo: {e}", {})
+            return AgentResult(self.stage, False, f"Failed to clone source repo: {e}", NO_ARTIFACTS)
 
 class CloneTargetAgent(BaseAgent):
     stage = JobStage.CLONE_TARGET
     def run(self, job, ws):
         try:
-            if ws.target_dir.exists() and any(ws.target_dir.iterdir()):
+            if not _clone_if_missing(job.target_repo_url, ws.target_dir):
                 return AgentResult(self.stage, True, "Target already present", {"target_dir": str(ws.target_dir)})
-            Repo.clone_from(job.target_repo_url, ws.target_dir, depth=1)
             return AgentResult(self.stage, True, "Cloned target repo", {"target_dir": str(ws.target_dir)})
         except Exception as e:
-            return AgentResult(self.stage, False, f"Failed to clone target repo: {e}", {})
+            return AgentResult(self.stage, False, f"Failed to clone target repo: {e}", NO_ARTIFACTS)
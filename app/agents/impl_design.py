@@ -1,32 +1,134 @@
+import hashlib
 import json
 import logging
+import mmap
+import multiprocessing
+import os
 import re
-import yaml
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from app.agents.base import BaseAgent, AgentResult
+from typing import Dict, List, Any, NamedTuple, Optional
+import orjson
+from app.agents.base import BaseAgent, AgentResult, NO_ARTIFACTS
 from app.core.workflow import JobStage
+from app.core.naming import to_kebab_case, to_snake_case
+from app.core.artifacts import load_json, replace_if_changed, wait_for_writes, workspace_rel, write_artifact_async, write_if_changed
 
 log = logging.getLogger(__name__)
 
 # Server-managed fields that should be excluded from Create schemas
-SERVER_MANAGED_FIELDS = {"id", "createdAt", "created_at", "updatedAt", "updated_at", "deletedAt", "deleted_at"}
+SERVER_MANAGED_FIELDS = frozenset({"id", "createdAt", "created_at", "updatedAt", "updated_at", "deletedAt", "deleted_at"})
 
+# Base URL assignments in API client files, tried in order. Bytes patterns:
+# client files are scanned undecoded and only the matched groups are decoded.
+# Matching is case-insensitive, so one pattern covers baseURL and baseUrl
+_BASE_URL_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    rb'baseURL\s*[:=]\s*["\']([^"\']+)["\']',
+    rb'base_url\s*[:=]\s*["\']([^"\']+)["\']',
+))
 
-def to_kebab_case(name: str) -> str:
-    """Convert PascalCase or camelCase to kebab-case."""
-    # Insert hyphen before uppercase letters (except the first)
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', name)
-    # Insert hyphen before uppercase letters that follow lowercase
-    s2 = re.sub('([a-z0-9])([A-Z])', r'\1-\2', s1)
-    return s2.lower()
+# Endpoint path literals: "/functions/", "/api/", "base44". Each pattern is
+# paired with the literal it requires; a plain literal search is much cheaper
+# than the full pattern, so files that lack the literal skip that pass
+_PATH_RES = tuple((re.compile(literal, re.IGNORECASE), re.compile(p, re.IGNORECASE)) for literal, p in (
+    (rb'/functions/', rb'["\'](/functions/[^"\']+)["\']'),
+    (rb'/api/', rb'["\'](/api/[^"\']+)["\']'),
+    (rb'base44', rb'["\']([^"\']*base44[^"\']*)["\']'),
+))
 
+# Path portion of an endpoint pathHint, without scheme/host prefix or query
+_ENDPOINT_PATH_RE = re.compile(r'^(?:(?=.*://)[^/]*/[^/]*/[^/]*(?:/|$)|/)?(?P<path>[^?]*)', re.DOTALL)
 
-def to_snake_case(name: str) -> str:
-    """Convert PascalCase or camelCase to snake_case."""
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
-    return s2.lower()
+# API client files at least this large are memory-mapped instead of read
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=1)
+def _no_alias_dumper():
+    """
+    Build the YAML dumper class on first use.
+
+    PyYAML is imported here rather than at module level, so processes that
+    only run DomainModelerAgent never load it.
+    """
+    import yaml
+    
+    # libyaml's C emitter is much faster on large specs; the pure-Python
+    # SafeDumper produces the same output when PyYAML was built without it
+    if yaml.__with_libyaml__:
+        base = yaml.CSafeDumper
+    else:
+        log.warning("PyYAML was built without libyaml; openapi.yaml is written with the slower pure-Python dumper")
+        base = yaml.SafeDumper
+    
+    class NoAliasDumper(base):
+        """Dumper that writes shared sub-objects out in full instead of as YAML aliases."""
+        def ignore_aliases(self, data):
+            return True
+    
+    return NoAliasDumper
+
+
+def _openapi_block_yaml() -> bool:
+    """
+    Whether openapi.yaml is written as block-style YAML (settings.openapi_block_yaml).
+
+    Settings are imported on first use rather than at module level, so
+    importing this module (as DomainModelerAgent does) needs no database or
+    Redis configuration. Without a usable configuration the default applies.
+    """
+    try:
+        from app.core.config import settings
+    except (ImportError, ValueError) as e:
+        log.debug(f"Settings unavailable, writing openapi.yaml as JSON: {e}")
+        return False
+    return settings.openapi_block_yaml
+
+
+# PyYAML's default line width, which the streamed output must reproduce
+_YAML_WIDTH = 80
+
+
+def _dump_yaml_block(data: Dict[str, Any], f, indent: int = 0) -> None:
+    """
+    Dump one mapping as a block nested `indent` columns deep in f.
+
+    The line width is reduced by the indent so long scalars wrap exactly where
+    a single yaml.dump of the whole document would wrap them; blank lines
+    inside multi-line scalars are left unindented, as the emitter writes them.
+    """
+    import yaml
+    
+    text = yaml.dump(
+        data, Dumper=_no_alias_dumper(), default_flow_style=False, sort_keys=False,
+        allow_unicode=True, width=_YAML_WIDTH - indent,
+    )
+    if indent:
+        prefix = " " * indent
+        text = "".join(prefix + line if line != "\n" else line for line in text.splitlines(keepends=True))
+    f.write(text)
+
+
+def _write_openapi_yaml(spec: Dict[str, Any], f) -> None:
+    """
+    Write the OpenAPI spec to f one path and one schema at a time.
+
+    Produces the same text as a single yaml.dump of the spec, but the emitter
+    only ever holds one path item or schema instead of the whole document.
+    """
+    for key, value in spec.items():
+        if key == "paths" and value:
+            f.write("paths:\n")
+            for path, item in value.items():
+                _dump_yaml_block({path: item}, f, indent=2)
+        elif key == "components" and list(value) == ["schemas"] and value["schemas"]:
+            f.write("components:\n  schemas:\n")
+            for name, schema in value["schemas"].items():
+                _dump_yaml_block({name: schema}, f, indent=4)
+        else:
+            _dump_yaml_block({key: value}, f)
 
 
 def to_camel_case(name: str) -> str:
@@ -36,6 +138,7 @@ def to_camel_case(name: str) -> str:
     return name[0].lower() + name[1:]
 
 
+@lru_cache(maxsize=2048)
 def entity_to_path(entity_name: str) -> str:
     """Convert entity name to API path (prefer kebab-case, fallback to snake-case)."""
     # Try kebab-case first, but if it looks like it's already snake_case, use that
@@ -44,41 +147,66 @@ def entity_to_path(entity_name: str) -> str:
     return to_kebab_case(entity_name)
 
 
+# Entity field type (lowercased) -> JSON schema type
+_FIELD_TYPE_MAP = {
+    "string": "string",
+    "number": "number",
+    "integer": "integer",
+    "int": "integer",
+    "boolean": "boolean",
+    "bool": "boolean",
+    "array": "array",
+    "object": "object",
+    "datetime": "string",  # OpenAPI uses string with format: date-time
+    "date": "string",  # OpenAPI uses string with format: date
+}
+
+# Entity field type (lowercased) -> JSON schema format
+_FORMAT_MAP = {"datetime": "date-time", "date": "date"}
+
+
 def map_field_type(field_type: str) -> str:
     """Map entity field type to JSON schema type."""
-    type_map = {
-        "string": "string",
-        "number": "number",
-        "integer": "integer",
-        "int": "integer",
-        "boolean": "boolean",
-        "bool": "boolean",
-        "array": "array",
-        "object": "object",
-        "datetime": "string",  # OpenAPI uses string with format: date-time
-        "date": "string",  # OpenAPI uses string with format: date
-    }
-    return type_map.get(field_type.lower(), "string")  # Default to string if unknown
+    return _FIELD_TYPE_MAP.get(field_type.lower(), "string")  # Default to string if unknown
+
 
+def _intern_schema(schema: Dict[str, Any], pool: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return the dict in pool equal to schema (same keys in the same order), adding it if new.
 
-def field_to_json_schema(field: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert entity field to JSON schema property."""
+    Only schemas made of scalar values are pooled. Nested values (enum,
+    items, properties) are taken as-is from the contract, so pooling those
+    would share contract objects between entities.
+    """
+    if any(isinstance(value, (dict, list)) for value in schema.values()):
+        return schema
+    try:
+        key = json.dumps(schema)
+    except (TypeError, ValueError):
+        return schema
+    return pool.setdefault(key, schema)
+
+
+def field_to_json_schema(field: Dict[str, Any], pool: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Convert entity field to JSON schema property.
+
+    With pool, fields of the same shape share one read-only dict from it.
+    """
     schema = {}
     
     # Get raw JSON schema info if available
     raw = field.get("raw", {})
     
     # Type mapping
-    field_type = field.get("type", "string")
-    schema_type = map_field_type(field_type)
+    ft_lower = field.get("type", "string").lower()
+    schema_type = _FIELD_TYPE_MAP.get(ft_lower, "string")  # Default to string if unknown
     schema["type"] = schema_type
     
     # Handle format for datetime/date
-    if field_type.lower() in ("datetime", "date"):
-        if field_type.lower() == "datetime":
-            schema["format"] = "date-time"
-        elif field_type.lower() == "date":
-            schema["format"] = "date"
+    fmt = _FORMAT_MAP.get(ft_lower)
+    if fmt:
+        schema["format"] = fmt
     elif "format" in raw:
         schema["format"] = raw["format"]
     
@@ -112,29 +240,45 @@ def field_to_json_schema(field: Dict[str, Any]) -> Dict[str, Any]:
     if "description" in raw:
         schema["description"] = raw["description"]
     
+    if pool is not None:
+        return _intern_schema(schema, pool)
     return schema
 
 
-def is_server_managed(field_name: str) -> bool:
-    """Check if a field name indicates it's server-managed."""
-    return field_name in SERVER_MANAGED_FIELDS
-
-
 def entity_to_schemas(entity: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     """Generate base, Create, and Update schemas for an entity."""
-    entity_name = entity["name"]
-    fields = entity.get("fields", [])
-    
-    # Base schema
+    return fields_to_schemas(entity["name"], entity.get("fields", []))
+
+
+def fields_to_schemas(
+    entity_name: str,
+    fields: List[Dict[str, Any]],
+    pool: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Generate base, Create, and Update schemas from an entity's name and field list."""
     base_properties = {}
     base_required = []
+    create_properties = {}
+    create_required = []
     
+    # One pass over the fields: each is converted once and the resulting dict
+    # is shared by the base, Create and Update schemas (never modified later)
     for field in fields:
         field_name = field["name"]
-        base_properties[field_name] = field_to_json_schema(field)
-        if field.get("required", False):
+        field_schema = field_to_json_schema(field, pool)
+        required = field.get("required", False)
+        
+        base_properties[field_name] = field_schema
+        if required:
             base_required.append(field_name)
+        
+        # Create schema excludes server-managed fields
+        if field_name not in SERVER_MANAGED_FIELDS:
+            create_properties[field_name] = field_schema
+            if required:
+                create_required.append(field_name)
     
+    # Base schema
     base_schema = {
         "type": "object",
         "properties": base_properties,
@@ -142,17 +286,7 @@ def entity_to_schemas(entity: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     if base_required:
         base_schema["required"] = base_required
     
-    # Create schema (exclude server-managed fields)
-    create_properties = {}
-    create_required = []
-    
-    for field in fields:
-        field_name = field["name"]
-        if not is_server_managed(field_name):
-            create_properties[field_name] = field_to_json_schema(field)
-            if field.get("required", False):
-                create_required.append(field_name)
-    
+    # Create schema
     create_schema = {
         "type": "object",
         "properties": create_properties,
@@ -161,15 +295,9 @@ def entity_to_schemas(entity: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         create_schema["required"] = create_required
     
     # Update schema (all fields optional)
-    update_properties = {}
-    for field in fields:
-        field_name = field["name"]
-        field_schema = field_to_json_schema(field)
-        update_properties[field_name] = field_schema
-    
     update_schema = {
         "type": "object",
-        "properties": update_properties,
+        "properties": base_properties.copy(),
     }
     
     return {
@@ -209,196 +337,125 @@ def get_error_responses() -> Dict[str, Any]:
     }
 
 
+# Fragments that are identical for every entity; shared by all generated
+# paths, which are only read after construction
+_ERROR_RESPONSES = get_error_responses()
+_LIST_PARAMETERS = [
+    {"name": "limit", "in": "query", "schema": {"type": "integer", "minimum": 1, "default": 100}, "description": "Maximum number of items to return"},
+    {"name": "offset", "in": "query", "schema": {"type": "integer", "minimum": 0, "default": 0}, "description": "Number of items to skip"},
+    {"name": "q", "in": "query", "schema": {"type": "string"}, "description": "Search query", "required": False},
+]
+_ID_PARAM_TEMPLATE = {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}
+
+
+def _json_content(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap a schema in an application/json content block."""
+    return {"application/json": {"schema": schema}}
+
+
+def _schema_ref(schema_name: str) -> Dict[str, str]:
+    """Reference a schema under components/schemas."""
+    return {"$ref": f"#/components/schemas/{schema_name}"}
+
+
+def _with_errors(status: str, description: str, schema: Dict[str, Any], error_responses: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an operation's responses: the success response followed by the shared error responses."""
+    responses = {status: {"description": description, "content": _json_content(schema)}}
+    responses.update(error_responses)
+    return responses
+
+
+# Delete responses name no entity, so every entity's delete operation shares them
+_DELETE_RESPONSES = _with_errors("200", "Successful response", {
+    "type": "object",
+    "properties": {"deleted": {"type": "boolean"}},
+    "required": ["deleted"]
+}, _ERROR_RESPONSES)
+
+
 def generate_crud_paths(entity_name: str, path_base: str) -> Dict[str, Any]:
     """Generate CRUD paths for an entity."""
-    paths = {}
     entity_camel = to_camel_case(entity_name)
-    error_responses = get_error_responses()
-    
-    # GET /api/{path_base} - List
-    list_path = f"/api/{path_base}"
-    list_responses = {
-        "200": {
-            "description": "Successful response",
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "items": {
-                                "type": "array",
-                                "items": {"$ref": f"#/components/schemas/{entity_name}"}
-                            },
-                            "total": {"type": "integer"}
-                        },
-                        "required": ["items", "total"]
-                    }
-                }
-            }
-        }
-    }
-    list_responses.update(error_responses)
+    error_responses = _ERROR_RESPONSES
+    tags = [entity_name]
     
-    paths[list_path] = {
-        "get": {
-            "operationId": f"{entity_camel}_list",
-            "tags": [entity_name],
-            "summary": f"List {entity_name} entities",
-            "parameters": [
-                {"name": "limit", "in": "query", "schema": {"type": "integer", "minimum": 1, "default": 100}, "description": "Maximum number of items to return"},
-                {"name": "offset", "in": "query", "schema": {"type": "integer", "minimum": 0, "default": 0}, "description": "Number of items to skip"},
-                {"name": "q", "in": "query", "schema": {"type": "string"}, "description": "Search query", "required": False},
-            ],
-            "responses": list_responses
-        }
-    }
+    # Sub-objects repeated across operations are built once and shared; the
+    # spec is only read after this and is dumped without YAML aliases
+    entity_ref = _schema_ref(entity_name)
+    item_responses = _with_errors("200", "Successful response", entity_ref, error_responses)
+    id_parameters = [{**_ID_PARAM_TEMPLATE, "description": f"{entity_name} ID"}]
+    update_body = {"required": True, "content": _json_content(_schema_ref(f"{entity_name}Update"))}
     
-    # POST /api/{path_base} - Create
-    create_responses = {
-        "201": {
-            "description": "Created",
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity_name}"}
-                }
-            }
-        }
-    }
-    create_responses.update(error_responses)
-    
-    paths[list_path]["post"] = {
-        "operationId": f"{entity_camel}_create",
-        "tags": [entity_name],
-        "summary": f"Create a new {entity_name}",
-        "requestBody": {
-            "required": True,
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity_name}Create"}
-                }
-            }
+    list_schema = {
+        "type": "object",
+        "properties": {
+            "items": {"type": "array", "items": entity_ref},
+            "total": {"type": "integer"}
         },
-        "responses": create_responses
+        "required": ["items", "total"]
     }
-    
-    # GET /api/{path_base}/{id} - Get one
+    # /api/{path_base} - List and Create
+    list_path = f"/api/{path_base}"
+    # /api/{path_base}/{id} - Get one, Replace, Partial update, Delete
     detail_path = f"/api/{path_base}/{{id}}"
-    get_responses = {
-        "200": {
-            "description": "Successful response",
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity_name}"}
-                }
-            }
-        }
-    }
-    get_responses.update(error_responses)
-    
-    paths[detail_path] = {
-        "get": {
-            "operationId": f"{entity_camel}_get",
-            "tags": [entity_name],
-            "summary": f"Get a {entity_name} by ID",
-            "parameters": [
-                {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}, "description": f"{entity_name} ID"}
-            ],
-            "responses": get_responses
-        }
-    }
-    
-    # PUT /api/{path_base}/{id} - Replace
-    update_responses = {
-        "200": {
-            "description": "Successful response",
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity_name}"}
-                }
-            }
-        }
-    }
-    update_responses.update(error_responses)
     
-    paths[detail_path]["put"] = {
-        "operationId": f"{entity_camel}_update",
-        "tags": [entity_name],
-        "summary": f"Replace a {entity_name}",
-        "parameters": [
-            {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}, "description": f"{entity_name} ID"}
-        ],
-        "requestBody": {
-            "required": True,
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity_name}Update"}
-                }
-            }
+    return {
+        list_path: {
+            "get": {
+                "operationId": f"{entity_camel}_list",
+                "tags": tags,
+                "summary": f"List {entity_name} entities",
+                "parameters": _LIST_PARAMETERS,
+                "responses": _with_errors("200", "Successful response", list_schema, error_responses)
+            },
+            "post": {
+                "operationId": f"{entity_camel}_create",
+                "tags": tags,
+                "summary": f"Create a new {entity_name}",
+                "requestBody": {"required": True, "content": _json_content(_schema_ref(f"{entity_name}Create"))},
+                "responses": _with_errors("201", "Created", entity_ref, error_responses)
+            },
         },
-        "responses": update_responses
-    }
-    
-    # PATCH /api/{path_base}/{id} - Partial update
-    patch_responses = {
-        "200": {
-            "description": "Successful response",
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity_name}"}
-                }
-            }
-        }
-    }
-    patch_responses.update(error_responses)
-    
-    paths[detail_path]["patch"] = {
-        "operationId": f"{entity_camel}_patch",
-        "tags": [entity_name],
-        "summary": f"Partially update a {entity_name}",
-        "parameters": [
-            {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}, "description": f"{entity_name} ID"}
-        ],
-        "requestBody": {
-            "required": True,
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity_name}Update"}
-                }
-            }
+        detail_path: {
+            "get": {
+                "operationId": f"{entity_camel}_get",
+                "tags": tags,
+                "summary": f"Get a {entity_name} by ID",
+                "parameters": id_parameters,
+                "responses": item_responses
+            },
+            "put": {
+                "operationId": f"{entity_camel}_update",
+                "tags": tags,
+                "summary": f"Replace a {entity_name}",
+                "parameters": id_parameters,
+                "requestBody": update_body,
+                "responses": item_responses
+            },
+            "patch": {
+                "operationId": f"{entity_camel}_patch",
+                "tags": tags,
+                "summary": f"Partially update a {entity_name}",
+                "parameters": id_parameters,
+                "requestBody": update_body,
+                "responses": item_responses
+            },
+            "delete": {
+                "operationId": f"{entity_camel}_delete",
+                "tags": tags,
+                "summary": f"Delete a {entity_name}",
+                "parameters": id_parameters,
+                "responses": _DELETE_RESPONSES
+            },
         },
-        "responses": patch_responses
-    }
-    
-    # DELETE /api/{path_base}/{id} - Delete
-    delete_responses = {
-        "200": {
-            "description": "Successful response",
-            "content": {
-                "application/json": {
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "deleted": {"type": "boolean"}
-                        },
-                        "required": ["deleted"]
-                    }
-                }
-            }
-        }
     }
-    delete_responses.update(error_responses)
-    
-    paths[detail_path]["delete"] = {
-        "operationId": f"{entity_camel}_delete",
-        "tags": [entity_name],
-        "summary": f"Delete a {entity_name}",
-        "parameters": [
-            {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}, "description": f"{entity_name} ID"}
-        ],
-        "responses": delete_responses
-    }
-    
-    return paths
+
+
+def _to_api_path(path: str) -> str:
+    """Ensure an upstream path starts with /api/."""
+    if path.startswith("/api/"):
+        return path
+    return "/api" + path if path.startswith("/") else "/api/" + path
 
 
 def parse_endpoint_path(endpoint: Dict[str, Any]) -> Optional[tuple[str, str]]:
@@ -409,26 +466,43 @@ def parse_endpoint_path(endpoint: Dict[str, Any]) -> Optional[tuple[str, str]]:
     if not path_hint or path_hint == "dynamic":
         return None
     
-    # Try to extract a clean path
-    # Remove protocol and domain if present
-    path = path_hint
-    if "://" in path:
-        # Extract path after domain
-        parts = path.split("/", 3)
-        if len(parts) >= 4:
-            path = "/" + parts[3]
-        else:
-            path = "/"
+    # Drop the protocol and domain (everything up to the third "/") when a
+    # "://" is present, or a single leading "/", and the query string
+    path = "/" + _ENDPOINT_PATH_RE.match(path_hint).group("path")
     
-    # Ensure starts with /
-    if not path.startswith("/"):
-        path = "/" + path
+    return (method, path)
+
+
+def _scan_api_client_content(content, client_file: str) -> List[Dict[str, Any]]:
+    """Find endpoint paths in the raw bytes (or mmap) of one API client file."""
+    endpoints = []
     
-    # Remove query params
-    if "?" in path:
-        path = path.split("?")[0]
+    # Look for base URLs
+    base_url = None
+    for pattern in _BASE_URL_RES:
+        match = pattern.search(content)
+        if match:
+            base_url = match.group(1).decode("utf-8", "ignore")
+            break
     
-    return (method, path)
+    # Look for path patterns
+    for literal, pattern in _PATH_RES:
+        if not literal.search(content):
+            continue
+        for match in pattern.finditer(content):
+            path = match.group(1).decode("utf-8", "ignore")
+            if base_url:
+                full_path = base_url.rstrip("/") + path
+            else:
+                full_path = path
+            
+            endpoints.append({
+                "method": "GET",  # Default, best-effort
+                "path": full_path,
+                "source": client_file,
+            })
+    
+    return endpoints
 
 
 def scan_api_client_files(source_dir: Path, api_client_files: List[str]) -> List[Dict[str, Any]]:
@@ -448,42 +522,12 @@ def scan_api_client_files(source_dir: Path, api_client_files: List[str]) -> List
                 continue
             
             try:
-                content = file_path.read_text(encoding="utf-8", errors="ignore")
-                
-                # Look for base URLs
-                base_url_patterns = [
-                    r'baseURL\s*[:=]\s*["\']([^"\']+)["\']',
-                    r'baseUrl\s*[:=]\s*["\']([^"\']+)["\']',
-                    r'base_url\s*[:=]\s*["\']([^"\']+)["\']',
-                ]
-                
-                base_url = None
-                for pattern in base_url_patterns:
-                    match = re.search(pattern, content, re.IGNORECASE)
-                    if match:
-                        base_url = match.group(1)
-                        break
-                
-                # Look for path patterns: "/functions/", "/api/", "base44"
-                path_patterns = [
-                    r'["\'](/functions/[^"\']+)["\']',
-                    r'["\'](/api/[^"\']+)["\']',
-                    r'["\']([^"\']*base44[^"\']*)["\']',
-                ]
-                
-                for pattern in path_patterns:
-                    for match in re.finditer(pattern, content, re.IGNORECASE):
-                        path = match.group(1)
-                        if base_url:
-                            full_path = base_url.rstrip("/") + path
-                        else:
-                            full_path = path
-                        
-                        endpoints.append({
-                            "method": "GET",  # Default, best-effort
-                            "path": full_path,
-                            "source": client_file,
-                        })
+                with open(file_path, "rb") as fh:
+                    if os.fstat(fh.fileno()).st_size >= _MMAP_MIN_SIZE:
+                        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                            endpoints.extend(_scan_api_client_content(content, client_file))
+                    else:
+                        endpoints.extend(_scan_api_client_content(fh.read(), client_file))
             except Exception as e:
                 log.debug(f"Error scanning API client file {client_file}: {e}")
                 continue
@@ -494,11 +538,141 @@ def scan_api_client_files(source_dir: Path, api_client_files: List[str]) -> List
     return endpoints
 
 
+@dataclass(slots=True, frozen=True)
+class ClassifiedEntity:
+    """One storage-plan entry; orjson writes it as a name/store/reason object."""
+    name: str
+    store: str
+    reason: str
+
+
+# Words in a timestamp field's description marking it as user-supplied
+_USER_SUPPLIED_RE = re.compile(r"user|supplied|provided|input", re.IGNORECASE)
+
+
+def _is_user_supplied_timestamp(raw: Dict[str, Any]) -> bool:
+    """True if a created_at field's description says the value comes from the user."""
+    return _USER_SUPPLIED_RE.search(raw.get("description", "")) is not None
+
+
+class _FieldIndex(NamedTuple):
+    """An entity's fields split by role in one pass; see _index_fields."""
+    has_id: bool
+    created_at: Optional[Dict[str, Any]]
+    updated_at: Optional[Dict[str, Any]]
+    columns: List[Dict[str, Any]]
+
+
+def _index_fields(fields: List[Dict[str, Any]]) -> _FieldIndex:
+    """
+    Walk an entity's fields once for the table generators.
+    
+    created_at/updated_at hold the first createdAt/created_at and
+    updatedAt/updated_at fields; columns keeps every other field (id
+    included) in contract order.
+    """
+    has_id = False
+    created_at = updated_at = None
+    columns = []
+    for field in fields:
+        name = field.get("name")
+        if name in ("created_at", "createdAt"):
+            if created_at is None:
+                created_at = field
+        elif name in ("updated_at", "updatedAt"):
+            if updated_at is None:
+                updated_at = field
+        else:
+            if name == "id":
+                has_id = True
+            columns.append(field)
+    return _FieldIndex(has_id, created_at, updated_at, columns)
+
+
 class DomainModelerAgent(BaseAgent):
     stage = JobStage.DESIGN_DB_SCHEMA
     
     # Constants for AUTO classification
     MAX_POSTGRES_FIELDS = 25
+    _RELATIONAL_SUFFIXES = ("Link", "Join", "Map", "Follow", "Interaction")
+    _PRIMITIVE_TYPES = frozenset({"string", "number", "integer", "boolean", "datetime", "date"})
+    
+    # Lowercased contract field type -> generated column/property type
+    _JSON_FIELD_TYPES = frozenset({"array", "object"})
+    _PG_TYPE_MAP = {
+        "string": "TEXT",
+        "number": "DOUBLE PRECISION",
+        "integer": "BIGINT",
+        "int": "BIGINT",
+        "boolean": "BOOLEAN",
+        "bool": "BOOLEAN",
+        "datetime": "TIMESTAMPTZ",
+        "date": "DATE",
+    }
+    _SA_TYPE_MAP = {
+        "string": "String",
+        "number": "Double",
+        "integer": "BigInteger",
+        "int": "BigInteger",
+        "boolean": "Boolean",
+        "bool": "Boolean",
+        "datetime": "TIMESTAMPTZ",
+        "date": "DateTime",
+    }
+    _ALEMBIC_TYPE_MAP = {
+        "string": "sa.String()",
+        "number": "sa.Double()",
+        "integer": "sa.BigInteger()",
+        "int": "sa.BigInteger()",
+        "boolean": "sa.Boolean()",
+        "bool": "sa.Boolean()",
+        "datetime": "TIMESTAMPTZ()",
+        "date": "sa.Date()",
+    }
+    _MONGO_TYPE_MAP = {
+        "string": "string",
+        "number": "number",
+        "integer": "integer",
+        "boolean": "boolean",
+        "datetime": "string",
+        "date": "string",
+        "array": "array",
+        "object": "object",
+    }
+    _PY_TYPE_MAP = {
+        "string": "str",
+        "number": "float",
+        "integer": "int",
+        "boolean": "bool",
+        "datetime": "datetime",
+        "date": "datetime",
+    }
+    
+    # Repository stub emitted after each Mongo model; {name} is the entity name,
+    # {lname} its lowercased form
+    _REPOSITORY_TEMPLATE = '''class {name}Repository:
+    """Repository interface for {name}."""
+
+    def find_by_id(self, id: str) -> Optional[{name}]:
+        """Find {lname} by ID."""
+        raise NotImplementedError
+
+    def find_all(self) -> List[{name}]:
+        """Find all {lname} entities."""
+        raise NotImplementedError
+
+    def create(self, entity: {name}) -> {name}:
+        """Create a new {lname}."""
+        raise NotImplementedError
+
+    def update(self, id: str, entity: {name}) -> Optional[{name}]:
+        """Update a {lname} by ID."""
+        raise NotImplementedError
+
+    def delete(self, id: str) -> bool:
+        """Delete a {lname} by ID."""
+        raise NotImplementedError
+'''
     
     def run(self, job, ws):
         try:
@@ -509,12 +683,11 @@ class DomainModelerAgent(BaseAgent):
                     self.stage,
                     False,
                     "ui-contract.json not found in workspace artifacts",
-                    {}
+                    NO_ARTIFACTS
                 )
             
             # Load contract
-            with open(contract_path, "r", encoding="utf-8") as f:
-                contract = json.load(f)
+            contract = load_json(contract_path)
             
             entities = contract.get("entities", [])
             if not entities:
@@ -522,7 +695,7 @@ class DomainModelerAgent(BaseAgent):
                     self.stage,
                     False,
                     "No entities found in ui-contract.json",
-                    {}
+                    NO_ARTIFACTS
                 )
             
             # Get db_stack and preferences
@@ -536,43 +709,47 @@ class DomainModelerAgent(BaseAgent):
             
             # Classify entities
             storage_plan = self._classify_entities(entities, db_stack, db_preferences, hybrid_strategy)
+            # Shared by every artifact generator below
+            entity_map = {e["name"]: e for e in entities}
+            
+            # Artifact writes run in the background while the next one is generated
+            pending_writes = []
             
             # Write storage-plan.json
             storage_plan_path = ws.artifacts_dir / "storage-plan.json"
-            storage_plan_path.write_text(
-                json.dumps(storage_plan, indent=2),
-            encoding="utf-8"
-        )
+            pending_writes.append(write_artifact_async(storage_plan_path, orjson.dumps(storage_plan, option=orjson.OPT_INDENT_2)))
             
             # Generate artifacts
             artifacts_index = {
-                "storage_plan": str(storage_plan_path.relative_to(ws.root))
+                "storage_plan": workspace_rel(ws, storage_plan_path)
             }
             
             # Always write db-schema.md
             db_schema_md_path = ws.artifacts_dir / "db-schema.md"
-            db_schema_md = self._generate_db_schema_md(storage_plan, entities)
-            db_schema_md_path.write_text(db_schema_md, encoding="utf-8")
-            artifacts_index["db_schema"] = str(db_schema_md_path.relative_to(ws.root))
+            db_schema_md = self._generate_db_schema_md(storage_plan, entities, entity_map)
+            pending_writes.append(write_artifact_async(db_schema_md_path, db_schema_md))
+            artifacts_index["db_schema"] = workspace_rel(ws, db_schema_md_path)
             
             # Count entities by store
-            postgres_entities = [e for e in storage_plan["entities"] if e["store"] == "postgres"]
-            mongo_entities = [e for e in storage_plan["entities"] if e["store"] == "mongo"]
+            postgres_entities = [e for e in storage_plan["entities"] if e.store == "postgres"]
+            mongo_entities = [e for e in storage_plan["entities"] if e.store == "mongo"]
             
             # Generate Postgres artifacts if needed
             if db_stack in ("postgres", "hybrid") and postgres_entities:
                 pg_artifacts = self._generate_postgres_artifacts(
-                    ws, storage_plan, entities, postgres_entities
+                    ws, storage_plan, entity_map, postgres_entities, pending_writes
                 )
                 artifacts_index.update(pg_artifacts)
             
             # Generate Mongo artifacts if needed
             if db_stack in ("mongo", "hybrid") and mongo_entities:
                 mongo_artifacts = self._generate_mongo_artifacts(
-                    ws, storage_plan, entities, mongo_entities
+                    ws, storage_plan, entity_map, mongo_entities, pending_writes
                 )
                 artifacts_index.update(mongo_artifacts)
             
+            wait_for_writes(pending_writes)
+            
             # Log counts
             log.info(
                 f"DomainModelerAgent: {len(entities)} total entities, "
@@ -594,7 +771,7 @@ class DomainModelerAgent(BaseAgent):
                 self.stage,
                 False,
                 f"DomainModelerAgent failed: {str(e)}",
-                {}
+                NO_ARTIFACTS
             )
     
     def _classify_entities(
@@ -611,6 +788,21 @@ class DomainModelerAgent(BaseAgent):
         mongo_overrides = set(db_preferences.get("mongoEntities", []))
         postgres_overrides = set(db_preferences.get("postgresEntities", []))
         
+        # Resolved once for the whole plan: the hybrid strategy ("auto" is kept
+        # for backwards compatibility and, like unknown strategies, maps to
+        # docToMongo) and the fixed store for single-database stacks
+        if hybrid_strategy in ("docToMongo", "postgresJsonbFirst"):
+            strategy = hybrid_strategy
+        else:
+            strategy = "docToMongo"
+        if db_stack == "postgres":
+            fixed_store = ("postgres", "db_stack is postgres")
+        elif db_stack == "mongo":
+            fixed_store = ("mongo", "db_stack is mongo")
+        else:
+            # Fallback (shouldn't happen)
+            fixed_store = ("postgres", "default fallback")
+        
         classified = []
         
         for entity in entities:
@@ -618,59 +810,16 @@ class DomainModelerAgent(BaseAgent):
             
             # Check explicit overrides first
             if entity_name in mongo_overrides:
-                classified.append({
-                    "name": entity_name,
-                    "store": "mongo",
-                    "reason": "explicit override in db_preferences.mongoEntities"
-                })
-                continue
-            
-            if entity_name in postgres_overrides:
-                classified.append({
-                    "name": entity_name,
-                    "store": "postgres",
-                    "reason": "explicit override in db_preferences.postgresEntities"
-                })
-                continue
-            
-            # AUTO classification (only if hybrid)
-            if db_stack == "hybrid":
-                # Determine strategy (auto is kept for backwards compatibility, maps to docToMongo)
-                if hybrid_strategy in ("docToMongo", "postgresJsonbFirst", "auto"):
-                    strategy = hybrid_strategy if hybrid_strategy != "auto" else "docToMongo"
-                    store, reason = self._classify_entity_auto(entity, strategy)
-                    classified.append({
-                        "name": entity_name,
-                        "store": store,
-                        "reason": reason
-                    })
-                else:
-                    # Fallback to docToMongo if unknown strategy
-                    store, reason = self._classify_entity_auto(entity, "docToMongo")
-                    classified.append({
-                        "name": entity_name,
-                        "store": store,
-                        "reason": reason
-                    })
-            elif db_stack == "postgres":
-                classified.append({
-                    "name": entity_name,
-                    "store": "postgres",
-                    "reason": "db_stack is postgres"
-                })
-            elif db_stack == "mongo":
-                classified.append({
-                    "name": entity_name,
-                    "store": "mongo",
-                    "reason": "db_stack is mongo"
-                })
+                store, reason = "mongo", "explicit override in db_preferences.mongoEntities"
+            elif entity_name in postgres_overrides:
+                store, reason = "postgres", "explicit override in db_preferences.postgresEntities"
+            elif db_stack == "hybrid":
+                # AUTO classification (only if hybrid)
+                store, reason = self._classify_entity_auto(entity, strategy)
             else:
-                # Fallback (shouldn't happen)
-                classified.append({
-                    "name": entity_name,
-                    "store": "postgres",
-                    "reason": "default fallback"
-                })
+                store, reason = fixed_store
+            
+            classified.append(ClassifiedEntity(entity_name, store, reason))
         
         return {
             "mode": mode,
@@ -697,25 +846,19 @@ class DomainModelerAgent(BaseAgent):
                 raw = field.get("raw", {})
                 
                 if field_type == "object":
-                    # Check if additionalProperties is truthy (can be True, dict, or any truthy value)
-                    has_additional_properties = "additionalProperties" in raw and raw.get("additionalProperties")
-                    # Check if properties exists (even if empty, we check existence)
-                    has_properties = "properties" in raw
-                    
-                    if has_additional_properties or has_properties:
-                        if has_additional_properties:
-                            return "mongo", f"field '{field['name']}' has additionalProperties"
-                        elif has_properties:
-                            return "mongo", f"field '{field['name']}' has properties"
+                    # additionalProperties can be True, a dict, or any truthy value;
+                    # properties counts even when empty
+                    if raw.get("additionalProperties"):
+                        return "mongo", f"field '{field['name']}' has additionalProperties"
+                    if "properties" in raw:
+                        return "mongo", f"field '{field['name']}' has properties"
                 elif field_type == "array":
                     items = raw.get("items", {})
                     if isinstance(items, dict):
-                        # Check if items.type == "object" OR items.properties exists
-                        if items.get("type") == "object" or "properties" in items:
-                            if items.get("type") == "object":
-                                return "mongo", f"field '{field['name']}' is array of objects"
-                            elif "properties" in items:
-                                return "mongo", f"field '{field['name']}' is array of objects with properties"
+                        if items.get("type") == "object":
+                            return "mongo", f"field '{field['name']}' is array of objects"
+                        if "properties" in items:
+                            return "mongo", f"field '{field['name']}' is array of objects with properties"
         
         elif strategy == "postgresJsonbFirst":
             # postgresJsonbFirst strategy: keep postgres unless deep nesting detected
@@ -725,26 +868,20 @@ class DomainModelerAgent(BaseAgent):
                 
                 if field_type == "array":
                     items = raw.get("items", {})
-                    if isinstance(items, dict) and items.get("type") == "object":
-                        # Array of objects - deep nesting
-                        return "mongo", f"field '{field['name']}' is array of objects (deep nesting)"
-                    if isinstance(items, dict) and "properties" in items:
-                        # Array of complex objects - deep nesting
-                        return "mongo", f"field '{field['name']}' is array of objects with nested properties (deep nesting)"
+                    if isinstance(items, dict):
+                        if items.get("type") == "object":
+                            # Array of objects - deep nesting
+                            return "mongo", f"field '{field['name']}' is array of objects (deep nesting)"
+                        if "properties" in items:
+                            # Array of complex objects - deep nesting
+                            return "mongo", f"field '{field['name']}' is array of objects with nested properties (deep nesting)"
                 elif field_type == "object":
-                    # Check nesting depth > 1
-                    if "properties" in raw and raw["properties"]:
+                    # Check nesting depth > 1. additionalProperties maps can stay in
+                    # postgres (stored as JSONB) unless this same check rejects them
+                    if raw.get("properties"):
                         depth = self._calculate_field_nesting_depth(raw)
                         if depth > 1:
                             return "mongo", f"field '{field['name']}' has nested properties (depth {depth} > 1)"
-                    # additionalProperties maps can stay in postgres (stored as JSONB)
-                    # Only reject if it has nested properties with depth > 1
-                    if "additionalProperties" in raw and raw.get("additionalProperties") is True:
-                        # Check if it has properties that are nested
-                        if "properties" in raw and raw["properties"]:
-                            depth = self._calculate_field_nesting_depth(raw)
-                            if depth > 1:
-                                return "mongo", f"field '{field['name']}' has additionalProperties map with nested properties (depth {depth} > 1)"
         
         # Rule 3: Check field count
         if len(fields) > self.MAX_POSTGRES_FIELDS:
@@ -759,24 +896,24 @@ class DomainModelerAgent(BaseAgent):
     
     def _calculate_field_nesting_depth(self, raw_schema: Dict[str, Any]) -> int:
         """Calculate nesting depth of a single field's schema."""
-        if not isinstance(raw_schema, dict):
-            return 0
-        
-        if "properties" not in raw_schema or not raw_schema["properties"]:
-            return 0
-        
-        max_depth = 1
-        for prop_value in raw_schema["properties"].values():
-            if isinstance(prop_value, dict):
-                prop_type = prop_value.get("type")
-                if prop_type == "object" and "properties" in prop_value:
-                    depth = 1 + self._calculate_field_nesting_depth(prop_value)
-                    max_depth = max(max_depth, depth)
-                elif prop_type == "array" and "items" in prop_value:
-                    items = prop_value["items"]
-                    if isinstance(items, dict) and items.get("type") == "object":
-                        depth = 1 + self._calculate_field_nesting_depth(items)
-                        max_depth = max(max_depth, depth)
+        # Walked with an explicit stack of (schema, depth): no per-level call
+        # overhead and no recursion limit on deeply nested schemas
+        max_depth = 0
+        stack = [(raw_schema, 1)]
+        while stack:
+            schema, depth = stack.pop()
+            if not isinstance(schema, dict) or not schema.get("properties"):
+                continue
+            max_depth = max(max_depth, depth)
+            for prop_value in schema["properties"].values():
+                if isinstance(prop_value, dict):
+                    prop_type = prop_value.get("type")
+                    if prop_type == "object" and "properties" in prop_value:
+                        stack.append((prop_value, depth + 1))
+                    elif prop_type == "array" and "items" in prop_value:
+                        items = prop_value["items"]
+                        if isinstance(items, dict) and items.get("type") == "object":
+                            stack.append((items, depth + 1))
         
         return max_depth
     
@@ -784,523 +921,387 @@ class DomainModelerAgent(BaseAgent):
         """Calculate maximum nesting depth in entity fields."""
         max_depth = 0
         
-        def depth_of_schema(schema: Any, current_depth: int = 0) -> int:
-            if not isinstance(schema, dict):
-                return current_depth
-            
-            if schema.get("type") == "object":
-                props = schema.get("properties", {})
-                if props:
-                    return max(
-                        depth_of_schema(v, current_depth + 1) for v in props.values()
-                    ) if props else current_depth + 1
-            elif schema.get("type") == "array":
-                items = schema.get("items", {})
-                return depth_of_schema(items, current_depth + 1)
-            
-            return current_depth
-        
-        for field in fields:
-            raw = field.get("raw", {})
-            depth = depth_of_schema(raw, 0)
+        # Each object level with properties, and each array level, adds one
+        stack = [(field.get("raw", {}), 0) for field in fields]
+        while stack:
+            schema, depth = stack.pop()
+            if isinstance(schema, dict):
+                schema_type = schema.get("type")
+                if schema_type == "object":
+                    props = schema.get("properties", {})
+                    if props:
+                        stack.extend((v, depth + 1) for v in props.values())
+                        continue
+                elif schema_type == "array":
+                    stack.append((schema.get("items", {}), depth + 1))
+                    continue
             max_depth = max(max_depth, depth)
         
         return max_depth
     
     def _is_relational_pattern(self, entity_name: str, fields: List[Dict[str, Any]]) -> bool:
         """Check if entity matches relational naming patterns."""
-        patterns = ["Link", "Join", "Map", "Follow", "Interaction"]
-        if any(entity_name.endswith(pattern) for pattern in patterns):
-            # Check if all fields are primitives
-            primitive_types = {"string", "number", "integer", "boolean", "datetime", "date"}
-            for field in fields:
-                field_type = field.get("type", "").lower()
-                if field_type not in primitive_types:
-                    return False
-            return True
-        return False
+        if not entity_name.endswith(self._RELATIONAL_SUFFIXES):
+            return False
+        # Check if all fields are primitives
+        return all(field.get("type", "").lower() in self._PRIMITIVE_TYPES for field in fields)
     
     def _generate_db_schema_md(
         self,
         storage_plan: Dict[str, Any],
-        entities: List[Dict[str, Any]]
+        entities: List[Dict[str, Any]],
+        entity_map: Dict[str, Dict[str, Any]]
     ) -> str:
         """Generate human-readable db-schema.md."""
-        lines = ["# Database Schema"]
-        lines.append("")
-        lines.append(f"**Storage Mode:** {storage_plan['mode']}")
-        lines.append("")
-        lines.append("## Entity Classification")
-        lines.append("")
-        
-        entity_map = {e["name"]: e for e in entities}
+        sections = [f"# Database Schema\n\n**Storage Mode:** {storage_plan['mode']}\n\n## Entity Classification\n"]
         
         for classified in storage_plan["entities"]:
-            entity_name = classified["name"]
-            store = classified["store"]
-            reason = classified["reason"]
-            entity = entity_map.get(entity_name, {})
+            entity = entity_map.get(classified.name, {})
             fields = entity.get("fields", [])
             
-            lines.append(f"### {entity_name}")
-            lines.append(f"- **Store:** {store}")
-            lines.append(f"- **Reason:** {reason}")
-            lines.append(f"- **Fields:** {len(fields)}")
-            lines.append("")
+            sections.append(
+                f"### {classified.name}\n"
+                f"- **Store:** {classified.store}\n"
+                f"- **Reason:** {classified.reason}\n"
+                f"- **Fields:** {len(fields)}\n"
+            )
+        
+        sections.append("## Field Details\n")
         
-        lines.append("## Field Details")
-        lines.append("")
+        # Store per entity name, first classification winning
+        stores = {c.name: c.store for c in reversed(storage_plan["entities"])}
         
         for entity in entities:
             entity_name = entity["name"]
             fields = entity.get("fields", [])
-            classified = next(
-                (e for e in storage_plan["entities"] if e["name"] == entity_name),
-                None
-            )
-            store = classified["store"] if classified else "unknown"
+            store = stores.get(entity_name, "unknown")
             
-            lines.append(f"### {entity_name} ({store})")
-            lines.append("")
-            for field in fields:
-                field_type = field.get("type", "unknown")
-                required = field.get("required", False)
-                nullable = field.get("nullable", False)
-                req_str = "required" if required else "optional"
-                null_str = "nullable" if nullable else "not nullable"
-                lines.append(f"- `{field['name']}`: {field_type} ({req_str}, {null_str})")
-            lines.append("")
+            field_lines = "".join(
+                f"- `{field['name']}`: {field.get('type', 'unknown')} "
+                f"({'required' if field.get('required', False) else 'optional'}, "
+                f"{'nullable' if field.get('nullable', False) else 'not nullable'})\n"
+                for field in fields
+            )
+            sections.append(f"### {entity_name} ({store})\n\n{field_lines}")
         
-        return "\n".join(lines)
+        return "\n".join(sections)
     
     def _generate_postgres_artifacts(
         self,
         ws,
         storage_plan: Dict[str, Any],
-        entities: List[Dict[str, Any]],
-        postgres_entities: List[Dict[str, Any]]
+        entity_map: Dict[str, Dict[str, Any]],
+        postgres_entities: List[ClassifiedEntity],
+        pending_writes: List[Future]
     ) -> Dict[str, str]:
         """Generate Postgres artifacts."""
         artifacts = {}
-        entity_map = {e["name"]: e for e in entities}
-        pg_entity_names = {e["name"] for e in postgres_entities}
+        # Each name once, in classification order
+        pg_entity_names = dict.fromkeys(e.name for e in postgres_entities)
         pg_entities = [entity_map[name] for name in pg_entity_names if name in entity_map]
         
         # Generate db-schema.sql
         sql_path = ws.artifacts_dir / "db-schema.sql"
         sql_content = self._generate_postgres_sql(pg_entities)
-        sql_path.write_text(sql_content, encoding="utf-8")
-        artifacts["db_schema_sql"] = str(sql_path.relative_to(ws.root))
+        pending_writes.append(write_artifact_async(sql_path, sql_content))
+        artifacts["db_schema_sql"] = workspace_rel(ws, sql_path)
         
         # Generate models_postgres.py
         models_path = ws.artifacts_dir / "models_postgres.py"
         models_content = self._generate_postgres_models(pg_entities)
-        models_path.write_text(models_content, encoding="utf-8")
-        artifacts["models_postgres"] = str(models_path.relative_to(ws.root))
+        pending_writes.append(write_artifact_async(models_path, models_content))
+        artifacts["models_postgres"] = workspace_rel(ws, models_path)
         
         # Generate Alembic migration
         migrations_dir = ws.artifacts_dir / "migrations"
         migrations_dir.mkdir(exist_ok=True)
         migration_path = migrations_dir / "0001_initial_schema.py"
         migration_content = self._generate_alembic_migration(pg_entities)
-        migration_path.write_text(migration_content, encoding="utf-8")
-        artifacts["alembic_migration"] = str(migration_path.relative_to(ws.root))
+        pending_writes.append(write_artifact_async(migration_path, migration_content))
+        artifacts["alembic_migration"] = workspace_rel(ws, migration_path)
         
         return artifacts
     
     def _generate_postgres_sql(self, entities: List[Dict[str, Any]]) -> str:
         """Generate PostgreSQL CREATE TABLE statements."""
-        lines = []
+        snake = to_snake_case
+        map_pg = self._map_postgres_type
+        tables = []
         
         for entity in entities:
-            entity_name = entity["name"]
-            table_name = to_snake_case(entity_name)
-            fields = entity.get("fields", [])
-            
-            lines.append(f"CREATE TABLE {table_name} (")
-            
-            # Check for id field
-            has_id = any(f.get("name") == "id" for f in fields)
-            if not has_id:
-                lines.append("    id TEXT PRIMARY KEY,")
-            
-            # Check for system timestamp fields
-            created_at_field = next((f for f in fields if f.get("name") in ("created_at", "createdAt")), None)
-            updated_at_field = next((f for f in fields if f.get("name") in ("updated_at", "updatedAt")), None)
+            # System timestamp fields are handled separately, after the columns
+            index = _index_fields(entity.get("fields", []))
+            created_at_field, updated_at_field = index.created_at, index.updated_at
             
             # Generate columns
-            column_lines = []
-            for field in fields:
-                field_name_raw = field["name"]
-                field_name = to_snake_case(field_name_raw)
+            column_lines = [] if index.has_id else ["    id TEXT PRIMARY KEY"]
+            add_column = column_lines.append
+            for field in index.columns:
+                field_name = snake(field["name"])
                 field_type = field.get("type", "string").lower()
-                required = field.get("required", False)
-                nullable = field.get("nullable", False)
                 raw = field.get("raw", {})
                 
                 # Handle id field specially
                 if field_name == "id":
-                    column_lines.append(f"    {field_name} TEXT PRIMARY KEY")
+                    add_column(f"    {field_name} TEXT PRIMARY KEY")
                     continue
                 
-                # Skip system timestamp fields - handle separately
-                if field_name_raw in ("created_at", "createdAt", "updated_at", "updatedAt"):
-                    continue
-                
-                # Map to PostgreSQL type
-                pg_type = self._map_postgres_type(field_type, raw)
-                
-                # Build column definition
-                col_def = f"    {field_name} {pg_type}"
-                if not nullable and required:
+                # Build column definition from the PostgreSQL type
+                col_def = f"    {field_name} {map_pg(field_type, raw)}"
+                if not field.get("nullable", False) and field.get("required", False):
                     col_def += " NOT NULL"
                 
                 # Add CHECK constraint for enums
                 if "enum" in raw:
                     enum_values = ", ".join(f"'{v}'" for v in raw["enum"])
-                    col_def = col_def.rstrip()
-                    col_def += f" CHECK ({field_name} IN ({enum_values}))"
+                    col_def = f"{col_def.rstrip()} CHECK ({field_name} IN ({enum_values}))"
                 
-                column_lines.append(col_def)
+                add_column(col_def)
             
             # Handle created_at
             if created_at_field:
                 # Field exists - check if user-supplied (default to system-managed)
-                field_name = to_snake_case(created_at_field["name"])
-                raw = created_at_field.get("raw", {})
-                # Check if description indicates user-supplied
-                description = raw.get("description", "").lower()
-                is_user_supplied = any(word in description for word in ["user", "supplied", "provided", "input"])
-                default_clause = "" if is_user_supplied else " DEFAULT now()"
-                required = created_at_field.get("required", False)
-                nullable = created_at_field.get("nullable", False)
-                not_null = " NOT NULL" if not nullable and required else ""
-                column_lines.append(f"    {field_name} TIMESTAMPTZ{not_null}{default_clause}")
+                default_clause = "" if _is_user_supplied_timestamp(created_at_field.get("raw", {})) else " DEFAULT now()"
+                not_null = " NOT NULL" if not created_at_field.get("nullable", False) and created_at_field.get("required", False) else ""
+                add_column(f"    {snake(created_at_field['name'])} TIMESTAMPTZ{not_null}{default_clause}")
             else:
                 # Add system-managed created_at
-                column_lines.append("    created_at TIMESTAMPTZ NOT NULL DEFAULT now()")
+                add_column("    created_at TIMESTAMPTZ NOT NULL DEFAULT now()")
             
             # Handle updated_at (always system-managed with DEFAULT now())
             if updated_at_field:
-                field_name = to_snake_case(updated_at_field["name"])
-                required = updated_at_field.get("required", False)
-                nullable = updated_at_field.get("nullable", False)
-                not_null = " NOT NULL" if not nullable and required else ""
-                column_lines.append(f"    {field_name} TIMESTAMPTZ{not_null} DEFAULT now()")
+                not_null = " NOT NULL" if not updated_at_field.get("nullable", False) and updated_at_field.get("required", False) else ""
+                add_column(f"    {snake(updated_at_field['name'])} TIMESTAMPTZ{not_null} DEFAULT now()")
             else:
                 # Add system-managed updated_at
-                column_lines.append("    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()")
+                add_column("    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()")
             
-            lines.append(",\n".join(column_lines))
-            lines.append(");")
-            lines.append("")
+            # One string per table; a missing id column is declared first
+            columns = ",\n".join(column_lines)
+            tables.append(f"CREATE TABLE {snake(entity['name'])} (\n{columns}\n);\n")
         
-        return "\n".join(lines)
+        return "\n".join(tables)
     
     def _map_postgres_type(self, field_type: str, raw: Dict[str, Any]) -> str:
         """Map field type to PostgreSQL type."""
-        type_map = {
-            "string": "TEXT",
-            "number": "DOUBLE PRECISION",
-            "integer": "BIGINT",
-            "int": "BIGINT",
-            "boolean": "BOOLEAN",
-            "bool": "BOOLEAN",
-            "datetime": "TIMESTAMPTZ",
-            "date": "DATE",
-        }
-        
         # Check for array/object - use JSONB
-        if field_type in ("array", "object"):
+        if field_type in self._JSON_FIELD_TYPES:
             return "JSONB"
         
-        return type_map.get(field_type.lower(), "TEXT")
+        return self._PG_TYPE_MAP.get(field_type.lower(), "TEXT")
     
     def _generate_postgres_models(self, entities: List[Dict[str, Any]]) -> str:
         """Generate SQLAlchemy models for Postgres entities."""
-        lines = [
-            "from sqlalchemy import Column, String, BigInteger, Boolean, Double, DateTime, Text, CheckConstraint, JSON",
-            "from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMPTZ",
-            "from sqlalchemy.ext.declarative import declarative_base",
-            "from datetime import datetime",
-            "",
-            "Base = declarative_base()",
-            "",
+        snake = to_snake_case
+        map_sa = self._map_sqlalchemy_type
+        blocks = [
+            "from sqlalchemy import Column, String, BigInteger, Boolean, Double, DateTime, Text, CheckConstraint, JSON\n"
+            "from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMPTZ\n"
+            "from sqlalchemy.ext.declarative import declarative_base\n"
+            "from datetime import datetime\n"
+            "\n"
+            "Base = declarative_base()\n"
         ]
         
         for entity in entities:
             entity_name = entity["name"]
-            table_name = to_snake_case(entity_name)
-            fields = entity.get("fields", [])
-            
-            lines.append(f"class {entity_name}(Base):")
-            lines.append(f'    __tablename__ = "{table_name}"')
-            lines.append("")
             
-            # Check for system timestamp fields
-            created_at_field = next((f for f in fields if f.get("name") in ("created_at", "createdAt")), None)
-            updated_at_field = next((f for f in fields if f.get("name") in ("updated_at", "updatedAt")), None)
+            # System timestamp fields are handled separately, after the columns
+            index = _index_fields(entity.get("fields", []))
+            created_at_field, updated_at_field = index.created_at, index.updated_at
             
             # Generate columns
-            has_id = False
-            for field in fields:
+            column_lines = []
+            add_column = column_lines.append
+            for field in index.columns:
                 field_name = field["name"]
-                snake_name = to_snake_case(field_name)
+                snake_name = snake(field_name)
                 field_type = field.get("type", "string").lower()
-                required = field.get("required", False)
-                nullable = field.get("nullable", False)
                 raw = field.get("raw", {})
                 
                 if field_name == "id":
-                    has_id = True
-                    lines.append(f'    {snake_name} = Column(String, primary_key=True)')
-                    continue
-                
-                # Skip system timestamp fields - handle separately
-                if field_name in ("created_at", "createdAt", "updated_at", "updatedAt"):
+                    add_column(f'    {snake_name} = Column(String, primary_key=True)')
                     continue
                 
                 # Map to SQLAlchemy type
-                sa_type = self._map_sqlalchemy_type(field_type, raw)
-                
-                # Build column definition
-                col_parts = [f"Column({sa_type}"]
-                if not nullable and required:
-                    col_parts.append("nullable=False")
-                col_parts.append(")")
-                col_def = ", ".join(col_parts)
-                
-                lines.append(f"    {snake_name} = {col_def}")
+                sa_type = map_sa(field_type, raw)
+                nullable_arg = "nullable=False, " if not field.get("nullable", False) and field.get("required", False) else ""
+                add_column(f"    {snake_name} = Column({sa_type}, {nullable_arg})")
             
             # Add id if missing
-            if not has_id:
-                lines.append("    id = Column(String, primary_key=True)")
+            if not index.has_id:
+                add_column("    id = Column(String, primary_key=True)")
             
             # Handle created_at
             if created_at_field:
-                field_name = to_snake_case(created_at_field["name"])
-                raw = created_at_field.get("raw", {})
-                description = raw.get("description", "").lower()
-                is_user_supplied = any(word in description for word in ["user", "supplied", "provided", "input"])
-                server_default = "" if is_user_supplied else ", server_default='now()'"
-                required = created_at_field.get("required", False)
-                nullable = created_at_field.get("nullable", False)
-                nullable_str = ", nullable=False" if not nullable and required else ""
-                lines.append(f"    {field_name} = Column(TIMESTAMPTZ{nullable_str}{server_default})")
+                server_default = "" if _is_user_supplied_timestamp(created_at_field.get("raw", {})) else ", server_default='now()'"
+                nullable_str = ", nullable=False" if not created_at_field.get("nullable", False) and created_at_field.get("required", False) else ""
+                add_column(f"    {snake(created_at_field['name'])} = Column(TIMESTAMPTZ{nullable_str}{server_default})")
             else:
-                lines.append("    created_at = Column(TIMESTAMPTZ, nullable=False, server_default='now()')")
+                add_column("    created_at = Column(TIMESTAMPTZ, nullable=False, server_default='now()')")
             
             # Handle updated_at (always system-managed)
             if updated_at_field:
-                field_name = to_snake_case(updated_at_field["name"])
-                required = updated_at_field.get("required", False)
-                nullable = updated_at_field.get("nullable", False)
-                nullable_str = ", nullable=False" if not nullable and required else ""
-                lines.append(f"    {field_name} = Column(TIMESTAMPTZ{nullable_str}, server_default='now()')")
+                nullable_str = ", nullable=False" if not updated_at_field.get("nullable", False) and updated_at_field.get("required", False) else ""
+                add_column(f"    {snake(updated_at_field['name'])} = Column(TIMESTAMPTZ{nullable_str}, server_default='now()')")
             else:
-                lines.append("    updated_at = Column(TIMESTAMPTZ, nullable=False, server_default='now()')")
+                add_column("    updated_at = Column(TIMESTAMPTZ, nullable=False, server_default='now()')")
             
-            lines.append("")
+            columns = "\n".join(column_lines)
+            blocks.append(f'class {entity_name}(Base):\n    __tablename__ = "{snake(entity_name)}"\n\n{columns}\n')
         
-        return "\n".join(lines)
+        return "\n".join(blocks)
     
     def _map_sqlalchemy_type(self, field_type: str, raw: Dict[str, Any]) -> str:
         """Map field type to SQLAlchemy type."""
-        type_map = {
-            "string": "String",
-            "number": "Double",
-            "integer": "BigInteger",
-            "int": "BigInteger",
-            "boolean": "Boolean",
-            "bool": "Boolean",
-            "datetime": "TIMESTAMPTZ",
-            "date": "DateTime",
-        }
-        
-        if field_type in ("array", "object"):
+        if field_type in self._JSON_FIELD_TYPES:
             return "JSON"
         
-        return type_map.get(field_type.lower(), "String")
+        return self._SA_TYPE_MAP.get(field_type.lower(), "String")
     
     def _generate_alembic_migration(self, entities: List[Dict[str, Any]]) -> str:
         """Generate Alembic migration file."""
         from datetime import datetime
         
+        snake = to_snake_case
+        map_alembic = self._map_alembic_type
         create_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        lines = [
-            '"""initial_schema',
-            "",
-            "Revision ID: 0001",
-            "Revises:",
-            f"Create Date: {create_date}",
-            '"""',
-            "",
-            "from alembic import op",
-            "import sqlalchemy as sa",
-            "from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMPTZ",
-            "",
-            "revision = '0001'",
-            "down_revision = None",
-            "branch_labels = None",
-            "depends_on = None",
-            "",
-            "def upgrade():",
+        blocks = [
+            '"""initial_schema\n'
+            "\n"
+            "Revision ID: 0001\n"
+            "Revises:\n"
+            f"Create Date: {create_date}\n"
+            '"""\n'
+            "\n"
+            "from alembic import op\n"
+            "import sqlalchemy as sa\n"
+            "from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMPTZ\n"
+            "\n"
+            "revision = '0001'\n"
+            "down_revision = None\n"
+            "branch_labels = None\n"
+            "depends_on = None\n"
+            "\n"
+            "def upgrade():"
         ]
         
         for entity in entities:
-            entity_name = entity["name"]
-            table_name = to_snake_case(entity_name)
             fields = entity.get("fields", [])
+            index = _index_fields(fields)
             
-            lines.append(f"    op.create_table(")
-            lines.append(f'        "{table_name}",')
-            
-            # Generate columns
-            has_id = False
-            column_defs = []
+            # Generate columns, declaring a missing id first
+            column_defs = [] if index.has_id else ['        sa.Column("id", sa.String(), primary_key=True),']
+            add_column = column_defs.append
             
             for field in fields:
                 field_name = field["name"]
-                snake_name = to_snake_case(field_name)
+                snake_name = snake(field_name)
                 field_type = field.get("type", "string").lower()
-                required = field.get("required", False)
-                nullable = field.get("nullable", False)
                 raw = field.get("raw", {})
                 
                 if field_name == "id":
-                    has_id = True
-                    column_defs.append(f'        sa.Column("{snake_name}", sa.String(), primary_key=True),')
+                    add_column(f'        sa.Column("{snake_name}", sa.String(), primary_key=True),')
                     continue
                 
                 # Map to Alembic type
-                alembic_type = self._map_alembic_type(field_type, raw)
-                
-                col_parts = [f'sa.Column("{snake_name}", {alembic_type})']
-                if not nullable and required:
-                    col_parts[-1] = col_parts[-1].rstrip(')') + ", nullable=False)"
-                column_defs.append("        " + col_parts[0])
-            
-            if not has_id:
-                column_defs.insert(0, '        sa.Column("id", sa.String(), primary_key=True),')
+                col_def = f'sa.Column("{snake_name}", {map_alembic(field_type, raw)})'
+                if not field.get("nullable", False) and field.get("required", False):
+                    col_def = col_def.rstrip(')') + ", nullable=False)"
+                add_column("        " + col_def)
             
             # Handle system timestamp fields
-            created_at_field = next((f for f in fields if f.get("name") in ("created_at", "createdAt")), None)
-            updated_at_field = next((f for f in fields if f.get("name") in ("updated_at", "updatedAt")), None)
+            created_at_field, updated_at_field = index.created_at, index.updated_at
             
             # Handle created_at
             if created_at_field:
-                field_name = to_snake_case(created_at_field["name"])
-                raw = created_at_field.get("raw", {})
-                description = raw.get("description", "").lower()
-                is_user_supplied = any(word in description for word in ["user", "supplied", "provided", "input"])
-                server_default = "" if is_user_supplied else ', server_default=sa.text("now()")'
-                required = created_at_field.get("required", False)
-                nullable = created_at_field.get("nullable", False)
-                nullable_str = ", nullable=False" if not nullable and required else ""
-                column_defs.append(f'        sa.Column("{field_name}", TIMESTAMPTZ(){nullable_str}{server_default}),')
+                server_default = "" if _is_user_supplied_timestamp(created_at_field.get("raw", {})) else ', server_default=sa.text("now()")'
+                nullable_str = ", nullable=False" if not created_at_field.get("nullable", False) and created_at_field.get("required", False) else ""
+                add_column(f'        sa.Column("{snake(created_at_field["name"])}", TIMESTAMPTZ(){nullable_str}{server_default}),')
             else:
-                column_defs.append('        sa.Column("created_at", TIMESTAMPTZ(), nullable=False, server_default=sa.text("now()")),')
+                add_column('        sa.Column("created_at", TIMESTAMPTZ(), nullable=False, server_default=sa.text("now()")),')
             
             # Handle updated_at (always system-managed)
             if updated_at_field:
-                field_name = to_snake_case(updated_at_field["name"])
-                required = updated_at_field.get("required", False)
-                nullable = updated_at_field.get("nullable", False)
-                nullable_str = ", nullable=False" if not nullable and required else ""
-                column_defs.append(f'        sa.Column("{field_name}", TIMESTAMPTZ(){nullable_str}, server_default=sa.text("now()")),')
+                nullable_str = ", nullable=False" if not updated_at_field.get("nullable", False) and updated_at_field.get("required", False) else ""
+                add_column(f'        sa.Column("{snake(updated_at_field["name"])}", TIMESTAMPTZ(){nullable_str}, server_default=sa.text("now()")),')
             else:
-                column_defs.append('        sa.Column("updated_at", TIMESTAMPTZ(), nullable=False, server_default=sa.text("now()")),')
+                add_column('        sa.Column("updated_at", TIMESTAMPTZ(), nullable=False, server_default=sa.text("now()")),')
             
-            lines.extend(column_defs)
-            lines.append("    )")
-            lines.append("")
-        
-        lines.extend([
-            "def downgrade():",
-        ])
+            columns = "\n".join(column_defs)
+            blocks.append(f'    op.create_table(\n        "{snake(entity["name"])}",\n{columns}\n    )\n')
         
-        for entity in reversed(entities):  # Reverse for downgrade
-            table_name = to_snake_case(entity["name"])
-            lines.append(f'    op.drop_table("{table_name}")')
+        blocks.append("def downgrade():")
+        # Reverse for downgrade
+        blocks.extend(f'    op.drop_table("{snake(entity["name"])}")' for entity in reversed(entities))
         
-        return "\n".join(lines)
+        return "\n".join(blocks)
     
     def _map_alembic_type(self, field_type: str, raw: Dict[str, Any]) -> str:
         """Map field type to Alembic/sqlalchemy type."""
-        type_map = {
-            "string": "sa.String()",
-            "number": "sa.Double()",
-            "integer": "sa.BigInteger()",
-            "int": "sa.BigInteger()",
-            "boolean": "sa.Boolean()",
-            "bool": "sa.Boolean()",
-            "datetime": "TIMESTAMPTZ()",
-            "date": "sa.Date()",
-        }
-        
-        if field_type in ("array", "object"):
+        if field_type in self._JSON_FIELD_TYPES:
             return "JSONB()"
         
-        return type_map.get(field_type.lower(), "sa.String()")
+        return self._ALEMBIC_TYPE_MAP.get(field_type.lower(), "sa.String()")
     
     def _generate_mongo_artifacts(
         self,
         ws,
         storage_plan: Dict[str, Any],
-        entities: List[Dict[str, Any]],
-        mongo_entities: List[Dict[str, Any]]
+        entity_map: Dict[str, Dict[str, Any]],
+        mongo_entities: List[ClassifiedEntity],
+        pending_writes: List[Future]
     ) -> Dict[str, str]:
         """Generate Mongo artifacts."""
         artifacts = {}
-        entity_map = {e["name"]: e for e in entities}
-        mongo_entity_names = {e["name"] for e in mongo_entities}
+        # Each name once, in classification order
+        mongo_entity_names = dict.fromkeys(e.name for e in mongo_entities)
         mongo_entities_list = [entity_map[name] for name in mongo_entity_names if name in entity_map]
         
         # Generate mongo-collections.md
         collections_path = ws.artifacts_dir / "mongo-collections.md"
         collections_content = self._generate_mongo_collections_md(mongo_entities_list)
-        collections_path.write_text(collections_content, encoding="utf-8")
-        artifacts["mongo_collections"] = str(collections_path.relative_to(ws.root))
+        pending_writes.append(write_artifact_async(collections_path, collections_content))
+        artifacts["mongo_collections"] = workspace_rel(ws, collections_path)
         
         # Generate mongo-schemas.json
         schemas_path = ws.artifacts_dir / "mongo-schemas.json"
         schemas_content = self._generate_mongo_schemas_json(mongo_entities_list)
-        schemas_path.write_text(json.dumps(schemas_content, indent=2), encoding="utf-8")
-        artifacts["mongo_schemas"] = str(schemas_path.relative_to(ws.root))
+        pending_writes.append(write_artifact_async(schemas_path, orjson.dumps(schemas_content, option=orjson.OPT_INDENT_2)))
+        artifacts["mongo_schemas"] = workspace_rel(ws, schemas_path)
         
         # Generate models_mongo.py
         models_path = ws.artifacts_dir / "models_mongo.py"
         models_content = self._generate_mongo_models(mongo_entities_list)
-        models_path.write_text(models_content, encoding="utf-8")
-        artifacts["models_mongo"] = str(models_path.relative_to(ws.root))
+        pending_writes.append(write_artifact_async(models_path, models_content))
+        artifacts["models_mongo"] = workspace_rel(ws, models_path)
         
         return artifacts
     
     def _generate_mongo_collections_md(self, entities: List[Dict[str, Any]]) -> str:
         """Generate mongo-collections.md document."""
-        lines = ["# MongoDB Collections"]
-        lines.append("")
+        sections = ["# MongoDB Collections\n"]
         
         for entity in entities:
             entity_name = entity["name"]
-            collection_name = self._to_mongo_collection_name(entity_name)
             fields = entity.get("fields", [])
             
-            lines.append(f"## {collection_name}")
-            lines.append(f"- **Entity:** {entity_name}")
-            lines.append(f"- **Fields:** {len(fields)}")
-            lines.append("")
-            lines.append("### Schema Summary")
-            lines.append("")
-            
-            for field in fields:
-                field_type = field.get("type", "unknown")
-                required = field.get("required", False)
-                lines.append(f"- `{field['name']}`: {field_type} ({'required' if required else 'optional'})")
-            
-            lines.append("")
+            field_lines = "".join(
+                f"- `{field['name']}`: {field.get('type', 'unknown')} "
+                f"({'required' if field.get('required', False) else 'optional'})\n"
+                for field in fields
+            )
+            sections.append(
+                f"## {self._to_mongo_collection_name(entity_name)}\n"
+                f"- **Entity:** {entity_name}\n"
+                f"- **Fields:** {len(fields)}\n"
+                "\n"
+                "### Schema Summary\n"
+                "\n"
+                f"{field_lines}"
+            )
         
-        return "\n".join(lines)
+        return "\n".join(sections)
     
     def _to_mongo_collection_name(self, entity_name: str) -> str:
         """Convert entity name to MongoDB collection name (snake_case plural)."""
@@ -1325,9 +1326,6 @@ class DomainModelerAgent(BaseAgent):
                 "required": []
             }
             
-            # Check if entity has id field
-            has_id_field = any(f.get("name") == "id" for f in fields)
-            
             # Add _id field (prefer string for Base44 IDs)
             schema["properties"]["_id"] = {
                 "type": "string",
@@ -1361,18 +1359,7 @@ class DomainModelerAgent(BaseAgent):
         schema = {}
         
         # Map types
-        type_map = {
-            "string": "string",
-            "number": "number",
-            "integer": "integer",
-            "boolean": "boolean",
-            "datetime": "string",
-            "date": "string",
-            "array": "array",
-            "object": "object",
-        }
-        
-        schema["type"] = type_map.get(field_type, "string")
+        schema["type"] = self._MONGO_TYPE_MAP.get(field_type, "string")
         
         # Preserve nested structures
         if "properties" in raw:
@@ -1402,6 +1389,7 @@ class DomainModelerAgent(BaseAgent):
     
     def _generate_mongo_models(self, entities: List[Dict[str, Any]]) -> str:
         """Generate Pydantic models for Mongo entities."""
+        map_py = self._map_python_type
         lines = [
             "from pydantic import BaseModel, Field",
             "from typing import Optional, List, Dict, Any",
@@ -1411,32 +1399,25 @@ class DomainModelerAgent(BaseAgent):
         
         for entity in entities:
             entity_name = entity["name"]
-            collection_name = self._to_mongo_collection_name(entity_name)
             fields = entity.get("fields", [])
             
-            lines.append(f"class {entity_name}(BaseModel):")
-            lines.append(f'    """MongoDB model for {collection_name} collection."""')
-            lines.append("")
-            
             # Generate fields
             has_id = False
+            field_defs = []
             for field in fields:
                 field_name = field["name"]
-                field_type = field.get("type", "string").lower()
-                required = field.get("required", False)
-                nullable = field.get("nullable", False)
-                raw = field.get("raw", {})
                 
                 if field_name == "id":
                     has_id = True
-                    lines.append(f'    id: str = Field(..., alias="_id", description="Document ID")')
+                    field_defs.append('    id: str = Field(..., alias="_id", description="Document ID")')
                     continue
                 
-                # Map to Python type
-                python_type = self._map_python_type(field_type, raw, required and not nullable)
-                field_def = f"    {field_name}: {python_type}"
+                required = field.get("required", False)
+                nullable = field.get("nullable", False)
+                raw = field.get("raw", {})
                 
-                # Add Field() if needed
+                # Map to Python type; Field() only when there is a default or description
+                python_type = map_py(field.get("type", "string").lower(), raw, required and not nullable)
                 field_args = []
                 if not required or nullable:
                     field_args.append("default=None")
@@ -1444,54 +1425,31 @@ class DomainModelerAgent(BaseAgent):
                     field_args.append(f'description="{raw["description"]}"')
                 
                 if field_args:
-                    field_def += " = Field(" + ", ".join(field_args) + ")"
-                
-                lines.append(field_def)
+                    field_defs.append(f"    {field_name}: {python_type} = Field({', '.join(field_args)})")
+                else:
+                    field_defs.append(f"    {field_name}: {python_type}")
             
             if not has_id:
-                lines.append('    id: str = Field(..., alias="_id", description="Document ID")')
-            
-            lines.append("")
-            lines.append("    class Config:")
-            lines.append("        populate_by_name = True")
-            lines.append("")
-            lines.append("")
-            lines.append(f"class {entity_name}Repository:")
-            lines.append(f'    """Repository interface for {entity_name}."""')
-            lines.append("")
-            lines.append(f"    def find_by_id(self, id: str) -> Optional[{entity_name}]:")
-            lines.append(f'        """Find {entity_name.lower()} by ID."""')
-            lines.append("        raise NotImplementedError")
-            lines.append("")
-            lines.append(f"    def find_all(self) -> List[{entity_name}]:")
-            lines.append(f'        """Find all {entity_name.lower()} entities."""')
-            lines.append("        raise NotImplementedError")
-            lines.append("")
-            lines.append(f"    def create(self, entity: {entity_name}) -> {entity_name}:")
-            lines.append(f'        """Create a new {entity_name.lower()}."""')
-            lines.append("        raise NotImplementedError")
-            lines.append("")
-            lines.append(f"    def update(self, id: str, entity: {entity_name}) -> Optional[{entity_name}]:")
-            lines.append(f'        """Update a {entity_name.lower()} by ID."""')
-            lines.append("        raise NotImplementedError")
-            lines.append("")
-            lines.append(f"    def delete(self, id: str) -> bool:")
-            lines.append(f'        """Delete a {entity_name.lower()} by ID."""')
-            lines.append("        raise NotImplementedError")
-            lines.append("")
+                field_defs.append('    id: str = Field(..., alias="_id", description="Document ID")')
+            
+            model_fields = "\n".join(field_defs)
+            lines.append(
+                f"class {entity_name}(BaseModel):\n"
+                f'    """MongoDB model for {self._to_mongo_collection_name(entity_name)} collection."""\n'
+                "\n"
+                f"{model_fields}\n"
+                "\n"
+                "    class Config:\n"
+                "        populate_by_name = True\n"
+                "\n"
+            )
+            lines.append(self._REPOSITORY_TEMPLATE.format(name=entity_name, lname=entity_name.lower()))
         
         return "\n".join(lines)
     
     def _map_python_type(self, field_type: str, raw: Dict[str, Any], required: bool) -> str:
         """Map field type to Python type annotation."""
-        type_map = {
-            "string": "str",
-            "number": "float",
-            "integer": "int",
-            "boolean": "bool",
-            "datetime": "datetime",
-            "date": "datetime",
-        }
+        type_map = self._PY_TYPE_MAP
         
         if field_type == "array":
             items = raw.get("items", {})
@@ -1511,6 +1469,72 @@ class DomainModelerAgent(BaseAgent):
         return python_type
 
 
+# Contracts with at least this many entities are converted in worker processes
+_PARALLEL_ENTITY_MIN = 200
+
+
+def _build_entity_artifacts(
+    entity_name: str,
+    fields: List[Dict[str, Any]],
+    pool: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> tuple[str, Dict[str, Any], Dict[str, Any]]:
+    """
+    Generate the schemas and CRUD paths for one entity (module-level so it can be pickled).
+
+    Field schemas are pooled in pool, or in a pool of their own when none is given.
+    """
+    if pool is None:
+        pool = {}
+    return entity_name, fields_to_schemas(entity_name, fields, pool), generate_crud_paths(entity_name, entity_to_path(entity_name))
+
+
+def _build_all_entity_artifacts(entities: List[Dict[str, Any]]) -> List[tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Generate schemas and paths for every entity, in contract order.
+
+    Only names and field lists are passed on (as parallel lists), so the
+    rest of each entity dict is never pickled. Large contracts are spread
+    over a process pool whose workers come from a forkserver, so they never
+    inherit the logging listener or artifact-writer threads (or locks held
+    by them) from this process. Small ones, and runs inside daemonic worker
+    processes (e.g. Celery prefork children, which may not fork), stay
+    in-process. In-process runs share one field-schema pool for the call;
+    each worker task pools only its own entity, since results are pickled
+    back one by one.
+    """
+    names = [entity["name"] for entity in entities]
+    fields_lists = [entity.get("fields", []) for entity in entities]
+    if len(entities) >= _PARALLEL_ENTITY_MIN and not multiprocessing.current_process().daemon:
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context("forkserver")) as executor:
+            return list(executor.map(_build_entity_artifacts, names, fields_lists, chunksize=32))
+    pool: Dict[str, Dict[str, Any]] = {}
+    return [_build_entity_artifacts(name, fields, pool) for name, fields in zip(names, fields_lists)]
+
+
+@lru_cache(maxsize=1)
+def _designer_fingerprint() -> str:
+    """Hash of this module's source, so designer changes invalidate cached specs."""
+    return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+
+
+def _stat_key(path: Path) -> Optional[List[int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _openapi_cache_key(contract_path: Path, source_dir: Path, api_client_files: List[str]) -> str:
+    """Cheap key for everything openapi.yaml depends on: the contract, scanned client files and this module."""
+    return json.dumps([
+        _designer_fingerprint(),
+        _openapi_block_yaml(),
+        _stat_key(contract_path),
+        [[name, _stat_key(source_dir / name)] for name in api_client_files],
+    ])
+
+
 class ApiDesignerAgent(BaseAgent):
     stage = JobStage.DESIGN_API
     
@@ -1523,28 +1547,42 @@ class ApiDesignerAgent(BaseAgent):
                     self.stage,
                     False,
                     f"ui-contract.json not found at {contract_path}",
-                    {}
+                    NO_ARTIFACTS
                 )
             
             # Read contract
-            contract = json.loads(contract_path.read_text(encoding="utf-8"))
+            contract = load_json(contract_path)
             
             entities = contract.get("entities", [])
             endpoints_used = contract.get("endpointsUsed", [])
             api_client_files = contract.get("apiClientFiles", [])
             
+            # Skip regeneration when the contract and scanned client files are unchanged
+            openapi_path = ws.artifacts_dir / "openapi.yaml"
+            cache_path = ws.artifacts_dir / ".openapi.cache"
+            cache_key = _openapi_cache_key(contract_path, ws.source_dir, api_client_files)
+            if openapi_path.exists() and cache_path.exists() and cache_path.read_text(encoding="utf-8") == cache_key:
+                return AgentResult(
+                    self.stage,
+                    True,
+                    "ui-contract.json unchanged, reused openapi.yaml",
+                    {"openapi": workspace_rel(ws, openapi_path)}
+                )
+            cache_path.unlink(missing_ok=True)
+            
             # Validate that we have something to work with
             if not entities and not endpoints_used:
                 return AgentResult(
                     self.stage,
                     False,
                     "Cannot generate OpenAPI spec: entities and endpointsUsed are both empty",
-                    {}
+                    NO_ARTIFACTS
                 )
             
-            # Build OpenAPI spec
-            schemas = {
-                "Error": {
+            # Build OpenAPI spec; schema and path entries are collected as
+            # (name, value) pairs and turned into dicts once at the end
+            schema_items = [
+                ("Error", {
                     "type": "object",
                     "properties": {
                         "error": {
@@ -1557,9 +1595,9 @@ class ApiDesignerAgent(BaseAgent):
                         }
                     },
                     "required": ["error"]
-                }
-            }
-            paths = {}
+                })
+            ]
+            path_items = []
             tags = []
             
             # Process entities
@@ -1567,23 +1605,20 @@ class ApiDesignerAgent(BaseAgent):
             schema_count = 0
             path_count = 0
             
-            for entity in entities:
-                entity_name = entity["name"]
+            for entity_name, entity_schemas, entity_paths in _build_all_entity_artifacts(entities):
                 entity_count += 1
                 
-                # Generate schemas
-                entity_schemas = entity_to_schemas(entity)
-                schemas.update(entity_schemas)
+                schema_items.extend(entity_schemas.items())
                 schema_count += len(entity_schemas)
                 
-                # Generate CRUD paths
-                path_base = entity_to_path(entity_name)
-                entity_paths = generate_crud_paths(entity_name, path_base)
-                paths.update(entity_paths)
+                path_items.extend(entity_paths.items())
                 path_count += len(entity_paths)
                 
                 # Add tag
                 tags.append({"name": entity_name})
+            schemas = dict(schema_items)
+            paths = dict(path_items)
+            tag_names = {tag["name"] for tag in tags}
             
             # Process endpointsUsed
             upstream_paths_added = 0
@@ -1592,12 +1627,7 @@ class ApiDesignerAgent(BaseAgent):
                     parsed = parse_endpoint_path(endpoint)
                     if parsed:
                         method, path = parsed
-                        # Ensure path starts with /api/ or add it
-                        if not path.startswith("/api/"):
-                            path = "/api" + path if path.startswith("/") else "/api/" + path
-                        
-                        if path not in paths:
-                            paths[path] = {}
+                        path = _to_api_path(path)
                         
                         # Create best-effort operation
                         operation = {
@@ -1632,12 +1662,13 @@ class ApiDesignerAgent(BaseAgent):
                                 }
                             }
                         
-                        paths[path][method.lower()] = operation
+                        paths.setdefault(path, {})[method.lower()] = operation
                         upstream_paths_added += 1
             
             # Add upstream tag if we added upstream paths
-            if upstream_paths_added > 0 and not any(tag["name"] == "upstream" for tag in tags):
+            if upstream_paths_added > 0 and "upstream" not in tag_names:
                 tags.append({"name": "upstream"})
+                tag_names.add("upstream")
             
             # Optional: scan API client files (best-effort)
             wrapper_endpoints = []
@@ -1645,16 +1676,10 @@ class ApiDesignerAgent(BaseAgent):
                 wrapper_endpoints = scan_api_client_files(ws.source_dir, api_client_files)
                 if wrapper_endpoints:
                     for endpoint in wrapper_endpoints:
-                        path = endpoint["path"]
+                        path = _to_api_path(endpoint["path"])
                         method = endpoint["method"]
                         
-                        if not path.startswith("/api/"):
-                            path = "/api" + path if path.startswith("/") else "/api/" + path
-                        
-                        if path not in paths:
-                            paths[path] = {}
-                        
-                        paths[path][method.lower()] = {
+                        paths.setdefault(path, {})[method.lower()] = {
                             "tags": ["upstream"],
                             "summary": f"{method} {path} (from wrapper)",
                             "responses": {
@@ -1672,8 +1697,9 @@ class ApiDesignerAgent(BaseAgent):
                             }
                         }
                     
-                    if not any(tag["name"] == "upstream" for tag in tags):
+                    if "upstream" not in tag_names:
                         tags.append({"name": "upstream"})
+                        tag_names.add("upstream")
             
             # Build OpenAPI document
             openapi_spec = {
@@ -1694,9 +1720,17 @@ class ApiDesignerAgent(BaseAgent):
             }
             
             # Write OpenAPI YAML
-            openapi_path = ws.artifacts_dir / "openapi.yaml"
-            with open(openapi_path, "w", encoding="utf-8") as f:
-                yaml.dump(openapi_spec, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+            # Both paths swap the file in atomically and leave an identical spec untouched
+            if _openapi_block_yaml():
+                tmp_openapi_path = openapi_path.with_name(openapi_path.name + ".tmp")
+                with open(tmp_openapi_path, "w", encoding="utf-8") as f:
+                    _write_openapi_yaml(openapi_spec, f)
+                replace_if_changed(tmp_openapi_path, openapi_path)
+            else:
+                write_if_changed(openapi_path, orjson.dumps(openapi_spec, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+            
+            # Record the inputs; written after the spec so a crash never leaves a matching key
+            write_if_changed(cache_path, cache_key)
             
             # Log counts
             log.info(
@@ -1708,7 +1742,7 @@ class ApiDesignerAgent(BaseAgent):
                 self.stage,
                 True,
                 f"Generated openapi.yaml with {entity_count} entities, {schema_count} schemas, {len(paths)} paths",
-                {"openapi": str(openapi_path.relative_to(ws.root))}
+                {"openapi": workspace_rel(ws, openapi_path)}
             )
         
         except Exception as e:
@@ -1717,5 +1751,5 @@ class ApiDesignerAgent(BaseAgent):
                 self.stage,
                 False,
                 f"Failed to generate openapi.yaml: {str(e)}",
-                {}
+                NO_ARTIFACTS
             )
@@ -1,7 +1,8 @@
 from pathlib import Path
 from git import Repo
-from app.agents.base import BaseAgent, AgentResult
+from app.agents.base import BaseAgent, AgentResult, NO_ARTIFACTS
 from app.core.workflow import JobStage
+from app.core.artifacts import workspace_rel
 
 class GitOpsAgent(BaseAgent):
     stage = JobStage.CREATE_PR
@@ -31,7 +32,7 @@ class GitOpsAgent(BaseAgent):
             return AgentResult(self.stage, True, "Committed locally (push/PR TODO)", {
                 "branch": branch_name,
                 "pushed": False,
-                "gitops_note": str(note.relative_to(ws.root)),
+                "gitops_note": workspace_rel(ws, note),
             })
         except Exception as e:
-            return AgentResult(self.stage, False, f"GitOps failed: {e}", {})
+            return AgentResult(self.stage, False, f"GitOps failed: {e}", NO_ARTIFACTS)
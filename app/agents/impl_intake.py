@@ -1,8 +1,9 @@
-import json
 import logging
+import orjson
 from pathlib import Path
-from app.agents.base import BaseAgent, AgentResult
+from app.agents.base import BaseAgent, AgentResult, NO_ARTIFACTS
 from app.core.workflow import JobStage
+from app.core.artifacts import workspace_rel, write_if_changed
 from app.agents.intake_scanner import (
     discover_entities,
     detect_framework,
@@ -27,7 +28,7 @@ class RepoIntakeAgent(BaseAgent):
                     self.stage,
                     False,
                     f"Source directory does not exist: {source_dir}",
-                    {}
+                    NO_ARTIFACTS
                 )
             
             log.info(f"Scanning source repository at {source_dir}")
@@ -114,8 +115,9 @@ class RepoIntakeAgent(BaseAgent):
                     "No environment variables detected. UI may not use NEXT_PUBLIC_* or VITE_* variables."
                 )
             
-            # Write contract file
-            artifact_path.write_text(json.dumps(contract, indent=2), encoding="utf-8")
+            # Write contract file; an unchanged contract keeps its mtime, so the
+            # design stages' caches keyed on it stay valid on re-runs
+            write_if_changed(artifact_path, orjson.dumps(contract, option=orjson.OPT_INDENT_2))
             log.info(f"Generated ui-contract.json with {len(entities_list)} entities, "
                     f"{len(endpoints)} endpoints, {len(env_vars)} env vars")
             
@@ -124,7 +126,7 @@ class RepoIntakeAgent(BaseAgent):
                 True,
                 f"Generated ui-contract.json with {len(entities_list)} entities, "
                 f"{len(endpoints)} endpoints",
-                {"ui_contract": str(artifact_path.relative_to(ws.root))}
+                {"ui_contract": workspace_rel(ws, artifact_path)}
             )
         
         except Exception as e:
@@ -139,11 +141,11 @@ class RepoIntakeAgent(BaseAgent):
                 "error_message": error_message,
                 "stage": str(self.stage),
             }
-            artifact_path.write_text(json.dumps(failure_artifact, indent=2), encoding="utf-8")
+            artifact_path.write_bytes(orjson.dumps(failure_artifact, option=orjson.OPT_INDENT_2))
             
             return AgentResult(
                 self.stage,
                 False,
                 f"Failed to generate ui-contract.json: {error_message}",
-                {"error_artifact": str(artifact_path.relative_to(ws.root))}
+                {"error_artifact": workspace_rel(ws, artifact_path)}
             )
@@ -1,14 +1,32 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Type
 from app.core.workflow import JobStage
 from app.agents.base import BaseAgent
 from app.agents.impl_clone import CloneSourceAgent, CloneTargetAgent
 from app.agents.impl_intake import RepoIntakeAgent
 from app.agents.impl_design import DomainModelerAgent, ApiDesignerAgent
-from app.agents.impl_build import BackendBuilderAgent, AsyncArchitectAgent, FrontendWiringAgent, VerificationAgent
+from app.agents.impl_build import (
+    BackendBuilderAgent, PlaceholderMarkersAgent, FrontendWiringAgent, VerificationAgent,
+)
 from app.agents.impl_client_adapter import Base44ClientAdapterAgent
 from app.agents.git_commit_agent import GitCommitAgent
 
+# Agent class per workflow stage. Kept explicit rather than collected from
+# BaseAgent subclasses because more than one agent declares CREATE_PR.
+AGENTS_BY_STAGE: Dict[JobStage, Type[BaseAgent]] = {
+    JobStage.CLONE_SOURCE: CloneSourceAgent,
+    JobStage.CLONE_TARGET: CloneTargetAgent,
+    JobStage.INTAKE_UI_CONTRACT: RepoIntakeAgent,
+    JobStage.DESIGN_DB_SCHEMA: DomainModelerAgent,
+    JobStage.DESIGN_API: ApiDesignerAgent,
+    JobStage.GENERATE_BACKEND: BackendBuilderAgent,
+    JobStage.ADAPT_CLIENT: Base44ClientAdapterAgent,
+    JobStage.ADD_ASYNC: PlaceholderMarkersAgent,
+    JobStage.WIRE_FRONTEND: FrontendWiringAgent,
+    JobStage.VERIFY: VerificationAgent,
+    JobStage.CREATE_PR: GitCommitAgent,
+}
+
 @dataclass
 class AgentRegistry:
     mapping: Dict[JobStage, BaseAgent]
@@ -18,16 +36,4 @@ class AgentRegistry:
 
     @staticmethod
     def default() -> "AgentRegistry":
-        return AgentRegistry(mapping={
-            JobStage.CLONE_SOURCE: CloneSourceAgent(),
-            JobStage.CLONE_TARGET: CloneTargetAgent(),
-            JobStage.INTAKE_UI_CONTRACT: RepoIntakeAgent(),
-            JobStage.DESIGN_DB_SCHEMA: DomainModelerAgent(),
-            JobStage.DESIGN_API: ApiDesignerAgent(),
-            JobStage.GENERATE_BACKEND: BackendBuilderAgent(),
-            JobStage.ADAPT_CLIENT: Base44ClientAdapterAgent(),
-            JobStage.ADD_ASYNC: AsyncArchitectAgent(),
-            JobStage.WIRE_FRONTEND: FrontendWiringAgent(),
-            JobStage.VERIFY: VerificationAgent(),
-            JobStage.CREATE_PR: GitCommitAgent(),
-        })
+        return AgentRegistry(mapping={stage: agent_cls() for stage, agent_cls in AGENTS_BY_STAGE.items()})
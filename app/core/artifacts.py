@@ -0,0 +1,168 @@
+"""
+Shared access to workspace artifact files.
+"""
+import filecmp
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple, Union
+
+import orjson
+
+log = logging.getLogger(__name__)
+
+# Shared pool for artifact writes, so agents can keep generating content
+# while earlier files are written out
+_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="artifact-writer")
+
+# Parsed JSON artifacts keyed by resolved path, stored with the
+# (st_mtime_ns, st_size) they were parsed at. Least recently used entries
+# are evicted past _JSON_CACHE_MAX, so a long-lived worker only keeps the
+# artifacts of its most recent jobs
+_JSON_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+_JSON_CACHE_MAX = 32
+_JSON_CACHE_LOCK = threading.Lock()
+
+
+def load_json(path: Path) -> Any:
+    """
+    Load a JSON artifact, reusing the parsed result while the file is unchanged.
+
+    Agents in one workflow run read the same artifacts (ui-contract.json,
+    storage-plan.json) stage after stage; the file's mtime and size decide
+    whether the cached value is still valid. The returned object is shared
+    between callers and must not be mutated.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = str(path.resolve())
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _JSON_CACHE_LOCK:
+        cached = _JSON_CACHE.get(key)
+        if cached is not None and cached[0] == version:
+            _JSON_CACHE.move_to_end(key)
+            return cached[1]
+
+    data = orjson.loads(path.read_bytes())
+    with _JSON_CACHE_LOCK:
+        _JSON_CACHE[key] = (version, data)
+        _JSON_CACHE.move_to_end(key)
+        while len(_JSON_CACHE) > _JSON_CACHE_MAX:
+            _JSON_CACHE.popitem(last=False)
+    return data
+
+
+def artifact_status(ws) -> Dict[str, os.DirEntry]:
+    """
+    List the workspace artifacts directory once, keyed by file name.
+
+    Lets an agent check for several required artifacts with one readdir;
+    a missing directory yields an empty mapping.
+    """
+    try:
+        with os.scandir(ws.artifacts_dir) as it:
+            return {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        return {}
+
+
+def has_entries(path) -> bool:
+    """True if path is a directory with at least one entry; reads a single entry."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def ensure_workspace_dirs(ws) -> None:
+    """Create every directory the workflow stages write into, in one pass up front."""
+    for path in (ws.artifacts_dir, ws.source_dir, ws.target_dir, Path(ws.root) / "generated" / "backend"):
+        os.makedirs(path, exist_ok=True)
+
+
+@lru_cache(maxsize=512)
+def _relative(root: Path, path: Path) -> str:
+    return str(path.relative_to(root))
+
+
+def workspace_rel(ws, path: Path) -> str:
+    """Return path relative to the workspace root, as recorded in artifact indexes."""
+    return _relative(Path(ws.root), Path(path))
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write data to path with raw os.write calls, truncating any existing file."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(path.name + ".tmp")
+
+
+def replace_if_changed(tmp_path: Path, path: Path) -> bool:
+    """
+    Move a fully written temp file over path with os.replace.
+
+    Readers see either the old or the new artifact, never a partial one. If
+    path already holds the same bytes the temp file is dropped instead and
+    False is returned, leaving the existing file (and its mtime) untouched.
+    """
+    tmp_path, path = Path(tmp_path), Path(path)
+    if path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+        tmp_path.unlink()
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_if_changed(path: Path, data: Union[str, bytes]) -> bool:
+    """Atomically replace path with data unless it already holds it; returns True if written."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp_path = _temp_path(path)
+    _write_bytes(tmp_path, data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _write_artifact(path: Path, data: Union[str, bytes]) -> None:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    _write_bytes(path, data)
+
+
+def write_artifact_async(path: Path, data: Union[str, bytes]) -> Future:
+    """
+    Queue an artifact write on the shared writer pool.
+
+    Strings are encoded as UTF-8 on the writer thread, so encoding a large
+    artifact overlaps with generating the next one. Callers must pass the
+    returned futures to wait_for_writes before reporting their stage as
+    done, so the next stage never sees a missing or partial file.
+    """
+    return _WRITE_EXECUTOR.submit(_write_artifact, Path(path), data)
+
+
+def wait_for_writes(futures: Iterable[Future]) -> None:
+    """Block until the given writes finish, re-raising the first failure."""
+    for future in futures:
+        future.result()
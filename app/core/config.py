@@ -15,5 +15,11 @@ class Settings(BaseSettings):
     github_api_base: str = "https://api.github.com"
 
     workspaces_dir: str = "/data/workspaces"
+    # Bare mirrors reused as --reference for repo clones; unset disables the cache
+    git_clone_cache_dir: str | None = None
+
+    # openapi.yaml is written as indented JSON (JSON is valid YAML) unless block-style
+    # YAML is requested; the YAML emitter is many times slower on large specs
+    openapi_block_yaml: bool = False
 
 settings = Settings()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 import logging
+from typing import Any, Mapping
 from sqlalchemy.orm import Session
 from app.core.workflow import JobStage
 from app.db.models import MigrationJob
 from app.workspace.manager import WorkspaceManager
 from app.agents.registry import AgentRegistry
+from app.core.artifacts import ensure_workspace_dirs
 
 log = logging.getLogger(__name__)
 
@@ -19,7 +21,7 @@ class WorkflowEngine:
         job.stage = stage
         self.db.commit()
 
-    def _merge_artifacts(self, job: MigrationJob, updates: dict) -> None:
+    def _merge_artifacts(self, job: MigrationJob, updates: Mapping[str, Any]) -> None:
         current = job.artifacts or {}
         current.update(updates)
         job.artifacts = current
@@ -34,12 +36,14 @@ class WorkflowEngine:
             JobStage.DESIGN_API,
             JobStage.GENERATE_BACKEND,
             JobStage.ADAPT_CLIENT,
+            # Also writes the WIRE_FRONTEND and VERIFY placeholders
             JobStage.ADD_ASYNC,
-            JobStage.WIRE_FRONTEND,
-            JobStage.VERIFY,
             JobStage.CREATE_PR,
         ]
 
+        # Create all stage output directories once instead of probing per agent
+        ensure_workspace_dirs(self.ws)
+
         for stage in stages:
             self._set_stage(job, stage)
             log.info("Running stage", extra={"job_id": self.job_id, "stage": str(stage)})
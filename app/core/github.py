@@ -14,6 +14,13 @@ class GitHubClient:
             "Accept": "application/vnd.github+json",
         }
 
+    def get_default_branch(self, owner: str, repo: str) -> str:
+        url = f"{self.api_base}/repos/{owner}/{repo}"
+        with httpx.Client(timeout=60) as client:
+            r = client.get(url, headers=self._headers())
+            r.raise_for_status()
+            return r.json()["default_branch"]
+
     async def create_pr(self, owner: str, repo: str, head: str, base: str, title: str, body: str) -> dict:
         url = f"{self.api_base}/repos/{owner}/{repo}/pulls"
         async with httpx.AsyncClient(timeout=60) as client:
@@ -25,4 +32,15 @@ class GitHubClient:
             r.raise_for_status()
             return r.json()
 
+    def create_pr_sync(self, owner: str, repo: str, head: str, base: str, title: str, body: str) -> dict:
+        url = f"{self.api_base}/repos/{owner}/{repo}/pulls"
+        with httpx.Client(timeout=60) as client:
+            r = client.post(
+                url,
+                headers=self._headers(),
+                json={"title": title, "head": head, "base": base, "body": body},
+            )
+            r.raise_for_status()
+            return r.json()
+
 # NOTE: For production, prefer a GitHub App installation token over a PAT.
@@ -1,4 +1,7 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 
 
@@ -13,12 +16,34 @@ class ContextFormatter(logging.Formatter):
         return super().format(record)
 
 
+_listener: logging.handlers.QueueListener | None = None
+
+
 def configure_logging() -> None:
+    """
+    Send log records through a queue to a background listener thread.
+
+    Agents only enqueue records; formatting and the stdout write happen on the
+    listener thread, so a slow pipe to the supervisor doesn't block a stage.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(ContextFormatter(
         "%(asctime)s %(levelname)s %(name)s [job_id=%(job_id)s stage=%(stage)s] - %(message)s"
     ))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    # Drain whatever is still queued when the process exits
+    atexit.register(_listener.stop)
+
+    queue_handler = logging.handlers.QueueHandler(records)
+    # The queued record carries the bare message; ContextFormatter adds the rest
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
     logging.basicConfig(
         level=logging.INFO,
-        handlers=[handler],
+        handlers=[queue_handler],
     )
@@ -0,0 +1,40 @@
+"""
+Case conversion for entity and field names, shared by the agents and generators.
+"""
+from functools import lru_cache
+
+# Character classes for case conversion (ASCII only, as in the original regexes)
+_ASCII_UPPER = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_ASCII_LOWER = frozenset("abcdefghijklmnopqrstuvwxyz")
+_ASCII_LOWER_DIGITS = _ASCII_LOWER | frozenset("0123456789")
+
+
+def _insert_word_separators(name: str, sep: str) -> str:
+    """
+    Insert sep at word boundaries in a PascalCase/camelCase name, in one pass.
+
+    A boundary is an uppercase letter that follows a lowercase letter or digit,
+    or that starts a capitalized word ("HTTPServer" -> "HTTP-Server"). Same
+    result as the two-regex conversion (.)([A-Z][a-z]+) then ([a-z0-9])([A-Z]).
+    """
+    out = []
+    last = len(name) - 1
+    for i, c in enumerate(name):
+        if i and c in _ASCII_UPPER:
+            prev = name[i - 1]
+            if prev in _ASCII_LOWER_DIGITS or (i < last and prev != "\n" and name[i + 1] in _ASCII_LOWER):
+                out.append(sep)
+        out.append(c)
+    return "".join(out)
+
+
+@lru_cache(maxsize=2048)
+def to_kebab_case(name: str) -> str:
+    """Convert PascalCase or camelCase to kebab-case."""
+    return _insert_word_separators(name, "-").lower()
+
+
+@lru_cache(maxsize=2048)
+def to_snake_case(name: str) -> str:
+    """Convert PascalCase or camelCase to snake_case."""
+    return _insert_word_separators(name, "_").lower()
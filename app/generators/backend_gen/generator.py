@@ -1,7 +1,7 @@
 """Orchestrator for backend code generation."""
-import json
 from pathlib import Path
 from typing import List, Dict, Any
+from app.core.artifacts import load_json
 from app.generators.backend_gen.types import (
     EntitySpec,
     StoragePlan,
@@ -54,12 +54,10 @@ def generate_backend(
         List of GeneratedFile objects
     """
     # Read ui-contract.json
-    with open(ui_contract_path, "r", encoding="utf-8") as f:
-        ui_contract = json.load(f)
+    ui_contract = load_json(ui_contract_path)
     
     # Read storage-plan.json
-    with open(storage_plan_path, "r", encoding="utf-8") as f:
-        storage_plan_data = json.load(f)
+    storage_plan_data = load_json(storage_plan_path)
     
     # Parse entities from ui-contract
     entities = []
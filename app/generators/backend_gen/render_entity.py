@@ -8,7 +8,7 @@ from app.generators.backend_gen.utils import (
 )
 
 
-SERVER_MANAGED_FIELDS = {"id", "createdAt", "created_at", "updatedAt", "updated_at", "deletedAt", "deleted_at"}
+SERVER_MANAGED_FIELDS = frozenset({"id", "createdAt", "created_at", "updatedAt", "updated_at", "deletedAt", "deleted_at"})
 
 
 def _map_field_to_pydantic_type(field: Dict[str, Any]) -> str:
@@ -31,11 +31,6 @@ def _map_field_to_pydantic_type(field: Dict[str, Any]) -> str:
     return type_map.get(field_type, "str")
 
 
-def _is_server_managed(field_name: str) -> bool:
-    """Check if field is server-managed."""
-    return field_name in SERVER_MANAGED_FIELDS
-
-
 def render_entity_model(entity_name: str, fields: List[Dict[str, Any]]) -> str:
     """Generate Pydantic models for an entity."""
     slug = entity_to_slug(entity_name)
@@ -64,7 +59,7 @@ def render_entity_model(entity_name: str, fields: List[Dict[str, Any]]) -> str:
     lines.append(f"class {entity_name}Create(BaseModel):")
     for field in fields:
         field_name = field["name"]
-        if _is_server_managed(field_name):
+        if field_name in SERVER_MANAGED_FIELDS:
             continue
         base_type = _map_field_to_pydantic_type(field)
         if not field.get("required", False) or field.get("nullable", False):
@@ -78,7 +73,7 @@ def render_entity_model(entity_name: str, fields: List[Dict[str, Any]]) -> str:
     lines.append(f"class {entity_name}Update(BaseModel):")
     for field in fields:
         field_name = field["name"]
-        if _is_server_managed(field_name):
+        if field_name in SERVER_MANAGED_FIELDS:
             continue
         base_type = _map_field_to_pydantic_type(field)
         lines.append(f"    {field_name}: Optional[{base_type}] = None")
@@ -1,9 +1,9 @@
 """Helper for generating minimal POST payloads for smoke testing."""
-import json
 from pathlib import Path
 from typing import Dict, Any, Optional
+from app.core.artifacts import load_json
 
-SERVER_MANAGED_FIELDS = {"id", "createdAt", "created_at", "updatedAt", "updated_at", "deletedAt", "deleted_at"}
+SERVER_MANAGED_FIELDS = frozenset({"id", "createdAt", "created_at", "updatedAt", "updated_at", "deletedAt", "deleted_at"})
 
 
 def build_minimal_payload(ui_contract_path: Path, entity_name: str) -> Dict[str, Any]:
@@ -18,8 +18,7 @@ def build_minimal_payload(ui_contract_path: Path, entity_name: str) -> Dict[str,
         Dictionary with minimal required fields set to default values
     """
     # Load ui-contract.json
-    with open(ui_contract_path, "r", encoding="utf-8") as f:
-        ui_contract = json.load(f)
+    ui_contract = load_json(ui_contract_path)
     
     # Find the entity
     entities = ui_contract.get("entities", [])
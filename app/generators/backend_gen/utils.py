@@ -1,20 +1,6 @@
 """Utility functions for backend generation."""
-import re
 from typing import Dict, List, Any
-
-
-def to_snake_case(name: str) -> str:
-    """Convert PascalCase or camelCase to snake_case."""
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
-    return s2.lower()
-
-
-def to_kebab_case(name: str) -> str:
-    """Convert PascalCase or camelCase to kebab-case."""
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', name)
-    s2 = re.sub('([a-z0-9])([A-Z])', r'\1-\2', s1)
-    return s2.lower()
+from app.core.naming import to_kebab_case, to_snake_case
 
 
 def entity_to_slug(entity_name: str) -> str:
@@ -1,6 +1,7 @@
 """File writer for backend generation."""
 from pathlib import Path
 from typing import List
+from app.core.artifacts import wait_for_writes, write_artifact_async
 from app.generators.backend_gen.types import GeneratedFile
 
 
@@ -8,17 +9,22 @@ def write_files(files: List[GeneratedFile], out_dir: Path) -> None:
     """
     Write generated files to the output directory.
     
+    Each directory is created once, then the file writes are queued on the
+    shared artifact writer pool and awaited together.
+    
     Args:
         files: List of GeneratedFile objects to write
         out_dir: Base output directory path
     """
     out_dir.mkdir(parents=True, exist_ok=True)
     
+    # Create parent directories once each
+    created_dirs = {out_dir}
     for file in files:
-        file_path = out_dir / file.path
-        # Create parent directories if needed
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        # Write file content
-        file_path.write_text(file.content, encoding="utf-8")
-
-
+        parent = (out_dir / file.path).parent
+        if parent not in created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(parent)
+    
+    # Write file contents concurrently
+    wait_for_writes([write_artifact_async(out_dir / file.path, file.content) for file in files])
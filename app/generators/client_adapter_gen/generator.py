@@ -5,6 +5,7 @@ Generates a compatibility SDK that mimics Base44 client API.
 import json
 from pathlib import Path
 from typing import Dict, List, Any
+from app.core.artifacts import wait_for_writes, write_artifact_async
 from app.generators.client_adapter_gen.utils import entity_to_slug, detect_language
 
 
@@ -37,44 +38,47 @@ def generate_base44_client_adapter(
         api_dir = target_dir / "src" / "api"
     api_dir.mkdir(parents=True, exist_ok=True)
     
+    # Module writes are queued on the shared writer pool and awaited below
+    pending_writes = []
+    
     # Generate HTTP client
     http_file = api_dir / f"http.{ext}"
-    http_file.write_text(_generate_http_client(ext), encoding="utf-8")
+    pending_writes.append(write_artifact_async(http_file, _generate_http_client(ext)))
     generated_files.append(str(http_file.relative_to(target_dir)))
     
     # Generate entities module
     entities_file = api_dir / f"entities.{ext}"
-    entities_file.write_text(_generate_entities_module(entities, ext), encoding="utf-8")
+    pending_writes.append(write_artifact_async(entities_file, _generate_entities_module(entities, ext)))
     generated_files.append(str(entities_file.relative_to(target_dir)))
     
     # Generate LLM module
     llm_file = api_dir / f"llm.{ext}"
-    llm_file.write_text(_generate_llm_module(ext), encoding="utf-8")
+    pending_writes.append(write_artifact_async(llm_file, _generate_llm_module(ext)))
     generated_files.append(str(llm_file.relative_to(target_dir)))
     
     # Generate storage stub
     storage_file = api_dir / f"storage.{ext}"
-    storage_file.write_text(_generate_storage_stub(ext), encoding="utf-8")
+    pending_writes.append(write_artifact_async(storage_file, _generate_storage_stub(ext)))
     generated_files.append(str(storage_file.relative_to(target_dir)))
     
     # Generate functions stub
     functions_file = api_dir / f"functions.{ext}"
-    functions_file.write_text(_generate_functions_stub(ext), encoding="utf-8")
+    pending_writes.append(write_artifact_async(functions_file, _generate_functions_stub(ext)))
     generated_files.append(str(functions_file.relative_to(target_dir)))
     
     # Generate integrations module (compatibility layer)
     integrations_file = api_dir / f"integrations.{ext}"
-    integrations_file.write_text(_generate_integrations_module(ext), encoding="utf-8")
+    pending_writes.append(write_artifact_async(integrations_file, _generate_integrations_module(ext)))
     generated_files.append(str(integrations_file.relative_to(target_dir)))
     
     # Generate auth stub
     auth_file = api_dir / f"auth.{ext}"
-    auth_file.write_text(_generate_auth_stub(ext), encoding="utf-8")
+    pending_writes.append(write_artifact_async(auth_file, _generate_auth_stub(ext)))
     generated_files.append(str(auth_file.relative_to(target_dir)))
     
     # Generate main base44Client
     client_file = api_dir / f"base44Client.{ext}"
-    client_file.write_text(_generate_base44_client(ext), encoding="utf-8")
+    pending_writes.append(write_artifact_async(client_file, _generate_base44_client(ext)))
     generated_files.append(str(client_file.relative_to(target_dir)))
     
     # Generate .env.example file (in frontend dir if it exists, otherwise target root)
@@ -86,6 +90,7 @@ def generate_base44_client_adapter(
     _generate_env_example(env_example_file)
     generated_files.append(str(env_example_file.relative_to(target_dir)))
     
+    wait_for_writes(pending_writes)
     return generated_files
 
 
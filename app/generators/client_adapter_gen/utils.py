@@ -1,13 +1,6 @@
 """Utility functions for client adapter generation."""
-import re
 from typing import Dict, List, Any
-
-
-def to_kebab_case(name: str) -> str:
-    """Convert PascalCase or camelCase to kebab-case."""
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', name)
-    s2 = re.sub('([a-z0-9])([A-Z])', r'\1-\2', s1)
-    return s2.lower()
+from app.core.naming import to_kebab_case
 
 
 def entity_to_slug(entity_name: str) -> str:
@@ -3,10 +3,10 @@ import json
 import tempfile
 import yaml
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from openapi_spec_validator import validate
 from openapi_spec_validator.readers import read_from_filename
-from app.agents.impl_design import ApiDesignerAgent
+from app.agents.impl_design import ApiDesignerAgent, _build_all_entity_artifacts, _build_entity_artifacts
 
 
 def test_api_designer_generates_openapi_from_contract():
@@ -126,6 +126,9 @@ def test_api_designer_generates_openapi_from_contract():
         openapi_path = artifacts_dir / "openapi.yaml"
         assert openapi_path.exists(), "openapi.yaml was not created"
         
+        # Schemas shared between Recipe/RecipeCreate/RecipeUpdate are written in full
+        assert "&id" not in openapi_path.read_text(encoding="utf-8"), "openapi.yaml contains YAML aliases"
+        
         # Parse YAML
         with open(openapi_path, "r", encoding="utf-8") as f:
             openapi_spec = yaml.safe_load(f)
@@ -331,3 +334,120 @@ def test_api_designer_handles_endpoints_used():
         tag_names = [tag["name"] for tag in openapi_spec["tags"]]
         assert "upstream" in tag_names
 
+
+
+def test_api_designer_reuses_spec_for_unchanged_contract():
+    """Test that openapi.yaml is regenerated only when ui-contract.json changes."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace_root = Path(temp_dir) / "test_workspace"
+        artifacts_dir = workspace_root / "workspace"
+        artifacts_dir.mkdir(parents=True)
+        source_dir = workspace_root / "source"
+        source_dir.mkdir(parents=True)
+        
+        contract = {
+            "apiClientFiles": [],
+            "entities": [
+                {"name": "Recipe", "fields": [{"name": "title", "type": "string", "required": True, "raw": {}}]}
+            ],
+            "endpointsUsed": [],
+        }
+        contract_path = artifacts_dir / "ui-contract.json"
+        contract_path.write_text(json.dumps(contract), encoding="utf-8")
+        
+        class MockWorkspace:
+            def __init__(self, root, source_dir, artifacts_dir):
+                self.root = root
+                self.source_dir = source_dir
+                self.artifacts_dir = artifacts_dir
+        
+        mock_ws = MockWorkspace(workspace_root, source_dir, artifacts_dir)
+        agent = ApiDesignerAgent()
+        
+        first = agent.run(MagicMock(), mock_ws)
+        assert first.ok, f"Agent failed: {first.message}"
+        assert first.message.startswith("Generated openapi.yaml")
+        
+        second = agent.run(MagicMock(), mock_ws)
+        assert second.ok
+        assert "unchanged" in second.message
+        assert second.artifacts_index == first.artifacts_index
+        
+        contract["entities"].append({"name": "Ingredient", "fields": []})
+        contract_path.write_text(json.dumps(contract), encoding="utf-8")
+        
+        third = agent.run(MagicMock(), mock_ws)
+        assert third.ok
+        assert third.message.startswith("Generated openapi.yaml")
+        with open(artifacts_dir / "openapi.yaml", "r", encoding="utf-8") as f:
+            assert "IngredientCreate" in yaml.safe_load(f)["components"]["schemas"]
+
+
+def test_entity_artifacts_from_process_pool_match_serial():
+    """Test that large contracts built in worker processes keep contract order and content."""
+    entities = [
+        {"name": f"Entity{i}", "fields": [{"name": "title", "type": "string", "required": True, "raw": {}}]}
+        for i in range(5)
+    ]
+    
+    with patch("app.agents.impl_design._PARALLEL_ENTITY_MIN", 2):
+        results = _build_all_entity_artifacts(entities)
+    
+    assert results == [_build_entity_artifacts(entity["name"], entity["fields"]) for entity in entities]
+
+
+def test_field_schema_pool_is_scoped_to_one_call():
+    """Test that same-shape fields share a schema within one call only, and contract values are never pooled."""
+    status = {"name": "status", "type": "string", "raw": {"enum": ["open", "closed"]}}
+    entities = [
+        {"name": f"Entity{i}", "fields": [{"name": "title", "type": "string", "raw": {}}, status]}
+        for i in range(2)
+    ]
+    
+    first = _build_all_entity_artifacts(entities)
+    second = _build_all_entity_artifacts(entities)
+    
+    title_schemas = [schemas[name]["properties"]["title"] for _, schemas, _ in first for name in schemas]
+    assert all(schema is title_schemas[0] for schema in title_schemas)
+    assert second[0][1]["Entity0"]["properties"]["title"] is not title_schemas[0]
+    status_schemas = [schemas[f"Entity{i}"]["properties"]["status"] for i, (_, schemas, _) in enumerate(first)]
+    assert status_schemas[0] is not status_schemas[1]
+
+
+def test_api_designer_block_yaml_matches_json_output():
+    """Test that the block-style YAML option describes the same spec as the default JSON output."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace_root = Path(temp_dir) / "test_workspace"
+        artifacts_dir = workspace_root / "workspace"
+        artifacts_dir.mkdir(parents=True)
+        source_dir = workspace_root / "source"
+        source_dir.mkdir(parents=True)
+        
+        contract = {
+            "apiClientFiles": [],
+            "entities": [
+                {"name": "Recipe", "fields": [{"name": "title", "type": "string", "required": True, "raw": {"description": "Titre é"}}]}
+            ],
+            "endpointsUsed": [],
+        }
+        (artifacts_dir / "ui-contract.json").write_text(json.dumps(contract), encoding="utf-8")
+        
+        class MockWorkspace:
+            def __init__(self, root, source_dir, artifacts_dir):
+                self.root = root
+                self.source_dir = source_dir
+                self.artifacts_dir = artifacts_dir
+        
+        mock_ws = MockWorkspace(workspace_root, source_dir, artifacts_dir)
+        openapi_path = artifacts_dir / "openapi.yaml"
+        
+        assert ApiDesignerAgent().run(MagicMock(), mock_ws).ok
+        json_text = openapi_path.read_text(encoding="utf-8")
+        assert json_text.startswith("{")
+        
+        with patch("app.agents.impl_design._openapi_block_yaml", return_value=True):
+            assert ApiDesignerAgent().run(MagicMock(), mock_ws).ok
+        yaml_text = openapi_path.read_text(encoding="utf-8")
+        assert yaml_text.startswith("openapi: 3.0.3")
+        
+        assert yaml.safe_load(yaml_text) == json.loads(json_text)
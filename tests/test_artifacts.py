@@ -0,0 +1,73 @@
+"""Unit tests for cached artifact loading and artifact writes."""
+import json
+import os
+from pathlib import Path
+from app.core import artifacts
+from app.core.artifacts import load_json, wait_for_writes, write_artifact_async, write_if_changed
+
+
+def test_load_json_reuses_parsed_result(tmp_path: Path):
+    """Test that an unchanged file is parsed once and shared."""
+    path = tmp_path / "storage-plan.json"
+    path.write_text(json.dumps({"mode": "postgres", "entities": []}), encoding="utf-8")
+
+    first = load_json(path)
+    assert first == {"mode": "postgres", "entities": []}
+    assert load_json(path) is first
+
+
+def test_load_json_evicts_least_recently_used(tmp_path: Path):
+    """Test that the cache keeps at most _JSON_CACHE_MAX files and drops the least recently used."""
+    paths = []
+    for i in range(artifacts._JSON_CACHE_MAX + 1):
+        path = tmp_path / f"artifact{i}.json"
+        path.write_text(json.dumps({"i": i}), encoding="utf-8")
+        paths.append(path)
+
+    first = load_json(paths[0])
+    second = load_json(paths[1])
+    for path in paths[2:-1]:
+        load_json(path)
+    assert load_json(paths[0]) is first
+    load_json(paths[-1])
+
+    assert len(artifacts._JSON_CACHE) <= artifacts._JSON_CACHE_MAX
+    assert load_json(paths[0]) is first
+    assert load_json(paths[1]) is not second
+
+
+def test_load_json_reloads_changed_file(tmp_path: Path):
+    """Test that rewriting the file invalidates the cached result."""
+    path = tmp_path / "ui-contract.json"
+    path.write_text(json.dumps({"entities": []}), encoding="utf-8")
+    load_json(path)
+
+    path.write_text(json.dumps({"entities": [{"name": "Recipe"}]}), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_json(path) == {"entities": [{"name": "Recipe"}]}
+
+
+def test_write_artifact_async_writes_utf8(tmp_path: Path):
+    """Test that queued writes are on disk once waited for."""
+    paths = [tmp_path / f"artifact{i}.md" for i in range(5)]
+    futures = [write_artifact_async(path, f"# Entity {i} – café\n") for i, path in enumerate(paths)]
+    wait_for_writes(futures)
+
+    for i, path in enumerate(paths):
+        assert path.read_text(encoding="utf-8") == f"# Entity {i} – café\n"
+
+
+def test_write_if_changed_skips_identical_content(tmp_path: Path):
+    """Test that identical content is not rewritten and no temp file is left behind."""
+    path = tmp_path / "openapi.yaml"
+    assert write_if_changed(path, '{"openapi": "3.0.3"}\n')
+    stat = path.stat()
+
+    assert not write_if_changed(path, b'{"openapi": "3.0.3"}\n')
+    assert path.stat().st_mtime_ns == stat.st_mtime_ns
+
+    assert write_if_changed(path, '{"openapi": "3.1.0"}\n')
+    assert path.read_text(encoding="utf-8") == '{"openapi": "3.1.0"}\n'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["openapi.yaml"]
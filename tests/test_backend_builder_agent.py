@@ -0,0 +1,45 @@
+"""Unit tests for BackendBuilderAgent's regeneration cache."""
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from app.agents.impl_build import BackendBuilderAgent
+
+
+class MockWorkspace:
+    """Mock workspace for testing."""
+    def __init__(self, root: Path):
+        self.root = root
+        self.artifacts_dir = root / "workspace"
+        self.artifacts_dir.mkdir()
+
+
+def _fake_generate_backend(job_id, ui_contract_path, storage_plan_path, out_dir):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "main.py").write_text("app = None\n", encoding="utf-8")
+    return ["main.py"]
+
+
+def test_backend_builder_skips_unchanged_inputs(tmp_path: Path):
+    """Test that generation reruns only when an input artifact changes."""
+    ws = MockWorkspace(tmp_path)
+    contract_path = ws.artifacts_dir / "ui-contract.json"
+    contract_path.write_text(json.dumps({"entities": []}), encoding="utf-8")
+    (ws.artifacts_dir / "storage-plan.json").write_text(json.dumps({"mode": "postgres"}), encoding="utf-8")
+
+    job = MagicMock()
+    job.id = "job-123"
+    agent = BackendBuilderAgent()
+
+    with patch("app.agents.impl_build.generate_backend", side_effect=_fake_generate_backend) as gen:
+        assert agent.run(job, ws).ok
+        second = agent.run(job, ws)
+        assert gen.call_count == 1
+        assert second.ok
+        assert "reused 1 generated files" in second.message
+
+        contract_path.write_text(json.dumps({"entities": [{"name": "Recipe"}]}), encoding="utf-8")
+        assert agent.run(job, ws).ok
+        assert gen.call_count == 2
+
+    # The cache marker must not end up in the copied backend directory
+    assert not any(p.name.endswith("gen-cache") for p in (tmp_path / "generated" / "backend").iterdir())
@@ -0,0 +1,168 @@
+"""Unit tests for base44Client usage scanning."""
+import pytest
+from pathlib import Path
+from app.agents import base44_scanner
+from app.agents.base44_scanner import FAST_MODE_STABLE_FILES, SCAN_WINDOW, scan_base44_client_usage, source_fingerprint
+
+
+@pytest.fixture
+def source_tree(tmp_path: Path) -> Path:
+    """Create a small frontend tree with base44Client usage."""
+    src = tmp_path / "src"
+    (src / "api").mkdir(parents=True)
+    (src / "pages").mkdir(parents=True)
+
+    (src / "api" / "base44Client.js").write_text(
+        "import { createClient } from '@base44/sdk';\n"
+        "export const base44 = createClient({ appId: 'x' });\n",
+        encoding="utf-8",
+    )
+    (src / "pages" / "Recipes.tsx").write_text(
+        "import React from 'react';\n"
+        "import { base44 } from '../api/base44Client';\n"
+        "\n"
+        "export default function Recipes() {\n"
+        "  const items = base44.entities.Recipe.list();\n"
+        "  base44.entities.Ingredient.filter({});\n"
+        "  return null;\n"
+        "}\n",
+        encoding="utf-8",
+    )
+    (src / "pages" / "Upload.jsx").write_text(
+        "export async function upload(f) {\n"
+        "  await base44.storage.upload(f);\n"
+        "  await base44.functions.resize(f);\n"
+        "}\n",
+        encoding="utf-8",
+    )
+    (src / "pages" / "notes.md").write_text(
+        "base44.entities.Ignored.list()\n", encoding="utf-8"
+    )
+
+    # Files under ignored directories must never be reported
+    vendored = tmp_path / "node_modules" / "pkg"
+    vendored.mkdir(parents=True)
+    (vendored / "index.js").write_text(
+        "import { base44 } from './base44Client';\nbase44.entities.Vendored.list();\n",
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+def test_scan_detects_imports_and_entities(source_tree: Path):
+    """Test that imports and entity calls are collected from source files."""
+    result = scan_base44_client_usage(source_tree)
+
+    assert result["usage"]["entities"] == ["Ingredient", "Recipe"]
+    assert "src/pages/Recipes.tsx" in result["clientFiles"]
+
+    locations = [loc for loc in result["importLocations"] if loc["file"] == "src/pages/Recipes.tsx"]
+    assert len(locations) == 1
+    assert locations[0]["lineRange"] == "2-2"
+    assert "base44Client" in locations[0]["snippetHint"]
+
+
+def test_scan_prunes_ignored_directories(source_tree: Path):
+    """Test that node_modules and non-source extensions are skipped."""
+    result = scan_base44_client_usage(source_tree)
+
+    assert not any(f.startswith("node_modules/") for f in result["clientFiles"])
+    assert "Vendored" not in result["usage"]["entities"]
+    assert "Ignored" not in result["usage"]["entities"]
+
+
+def test_scan_reports_storage_and_functions_usage(source_tree: Path):
+    """Test that storage/functions calls set usage flags and list the file."""
+    result = scan_base44_client_usage(source_tree)
+
+    assert result["usage"]["storage"] is True
+    assert result["usage"]["functions"] is True
+    assert result["usage"]["llm"] is False
+    assert "src/pages/Upload.jsx" in result["clientFiles"]
+
+
+def test_scan_keeps_non_ascii_snippets(tmp_path: Path):
+    """Test that import snippets are decoded as UTF-8 despite the latin-1 scan."""
+    (tmp_path / "Menu.jsx").write_text(
+        "import { base44 } from './base44Client'; // menú del día\n"
+        "base44.entities.Dish.list();\n",
+        encoding="utf-8",
+    )
+    result = scan_base44_client_usage(tmp_path)
+
+    assert result["importLocations"][0]["snippetHint"].endswith("// menú del día")
+    assert result["usage"]["entities"] == ["Dish"]
+
+
+def test_scan_fast_mode_stops_once_usage_is_stable(tmp_path: Path):
+    """Test that fast_mode stops after enough files add nothing new."""
+    for i in range(FAST_MODE_STABLE_FILES + 50):
+        (tmp_path / f"page{i}.js").write_text(
+            "base44.entities.Recipe.list();\n"
+            "base44.storage.upload(f);\n"
+            "base44.functions.resize(f);\n"
+            "base44.llm.invoke(p);\n",
+            encoding="utf-8",
+        )
+
+    full = scan_base44_client_usage(tmp_path)
+    fast = scan_base44_client_usage(tmp_path, fast_mode=True)
+
+    assert len(full["clientFiles"]) == FAST_MODE_STABLE_FILES + 50
+    assert len(fast["clientFiles"]) == FAST_MODE_STABLE_FILES + 2
+    assert fast["usage"] == full["usage"]
+    assert "fast mode" in fast["notes"][-1]
+
+
+def test_scan_fast_mode_reads_fewer_files(tmp_path: Path, monkeypatch):
+    """Test that fast_mode stops walking and reading files instead of queueing the whole tree."""
+    total = 2 * FAST_MODE_STABLE_FILES + 2 * SCAN_WINDOW
+    for i in range(total):
+        (tmp_path / f"page{i}.js").write_text(
+            "base44.entities.Recipe.list();\n"
+            "base44.storage.upload(f);\n"
+            "base44.functions.resize(f);\n"
+            "base44.llm.invoke(p);\n",
+            encoding="utf-8",
+        )
+    walked, reads = [], []
+    scandir_recursive = base44_scanner._scandir_recursive
+    scan_file = base44_scanner._scan_file
+
+    def counting_scandir_recursive(*args):
+        for entry in scandir_recursive(*args):
+            walked.append(entry.name)
+            yield entry
+
+    def counting_scan_file(entry, source_dir):
+        reads.append(entry.name)
+        return scan_file(entry, source_dir)
+
+    monkeypatch.setattr(base44_scanner, "_scandir_recursive", counting_scandir_recursive)
+    monkeypatch.setattr(base44_scanner, "_scan_file", counting_scan_file)
+
+    scan_base44_client_usage(tmp_path, fast_mode=True)
+
+    assert len(walked) <= FAST_MODE_STABLE_FILES + 2 + SCAN_WINDOW
+    assert len(reads) <= len(walked) < total
+
+
+def test_source_fingerprint_tracks_scanned_files_only(source_tree: Path):
+    """Test that the fingerprint changes with scanned sources but not other files."""
+    before = source_fingerprint(source_tree)
+    assert source_fingerprint(source_tree) == before
+
+    (source_tree / "src" / "pages" / "notes.md").write_text("changed\n", encoding="utf-8")
+    (source_tree / "node_modules" / "pkg" / "index.js").write_text("changed\n", encoding="utf-8")
+    assert source_fingerprint(source_tree) == before
+
+    (source_tree / "src" / "pages" / "Upload.jsx").write_text("base44.llm.invoke();\n", encoding="utf-8")
+    assert source_fingerprint(source_tree) != before
+
+
+def test_source_fingerprint_tracks_scanner_code(source_tree: Path, monkeypatch):
+    """Test that a change to the scanner itself changes the fingerprint of an unchanged tree."""
+    before = source_fingerprint(source_tree)
+    monkeypatch.setattr(base44_scanner, "_scanner_fingerprint", lambda: b"changed scanner")
+
+    assert source_fingerprint(source_tree) != before
@@ -0,0 +1,51 @@
+"""Unit tests for Base44ClientAdapterAgent's usage-scan cache."""
+import orjson
+import pytest
+from pathlib import Path
+from app.agents.base44_scanner import source_fingerprint
+from app.agents.impl_client_adapter import Base44ClientAdapterAgent
+
+
+class MockWorkspace:
+    def __init__(self, root: Path):
+        self.root = root
+        self.source_dir = root / "source"
+        self.artifacts_dir = root / "workspace"
+
+
+@pytest.fixture
+def ws(tmp_path: Path) -> MockWorkspace:
+    """Workspace whose source tree uses base44.entities.Recipe."""
+    ws = MockWorkspace(tmp_path)
+    (ws.source_dir / "src").mkdir(parents=True)
+    ws.artifacts_dir.mkdir()
+    (ws.source_dir / "src" / "Recipes.jsx").write_text(
+        "import { base44 } from './api/base44Client';\n"
+        "base44.entities.Recipe.list();\n",
+        encoding="utf-8",
+    )
+    return ws
+
+
+def test_truncated_usage_cache_is_rescanned(ws: MockWorkspace):
+    """Test that a partially written cache file falls back to a fresh scan and is replaced."""
+    cached_path = ws.artifacts_dir / f"base44-client-usage.{source_fingerprint(ws.source_dir)}.json"
+    cached_path.write_bytes(b'{"imports": [')
+
+    usage, usage_bytes = Base44ClientAdapterAgent()._scan_source_usage(ws)
+
+    assert usage["usage"]["entities"] == ["Recipe"]
+    assert orjson.loads(cached_path.read_bytes()) == usage
+    assert usage_bytes == cached_path.read_bytes()
+
+
+def test_usage_cache_keeps_only_current_fingerprint(ws: MockWorkspace):
+    """Test that scanning a changed source tree removes caches for earlier fingerprints."""
+    agent = Base44ClientAdapterAgent()
+    agent._scan_source_usage(ws)
+    (ws.source_dir / "src" / "Upload.jsx").write_text("base44.storage.upload(f);\n", encoding="utf-8")
+
+    agent._scan_source_usage(ws)
+
+    cache_files = list(ws.artifacts_dir.glob("base44-client-usage.*.json"))
+    assert [p.name for p in cache_files] == [f"base44-client-usage.{source_fingerprint(ws.source_dir)}.json"]
@@ -501,3 +501,49 @@ def test_domain_modeler_explicit_overrides():
         assert recipe_classified["store"] == "postgres", "Recipe should be postgres due to override"
         assert "explicit override" in recipe_classified["reason"].lower()
 
+
+def test_domain_modeler_nesting_depth_beyond_recursion_limit():
+    """Test that nesting depth is computed for schemas deeper than the recursion limit."""
+    agent = DomainModelerAgent()
+    
+    schema = {"type": "object", "properties": {"leaf": {"type": "string"}}}
+    for _ in range(1999):
+        schema = {"type": "object", "properties": {"child": schema}}
+    
+    assert agent._calculate_field_nesting_depth(schema) == 2000
+    assert agent._calculate_max_nesting_depth([{"name": "deep", "raw": schema}]) == 2000
+
+
+def test_domain_modeler_postgres_tables_follow_contract_order(tmp_path):
+    """Test that Postgres artifacts list tables in ui-contract.json order."""
+    artifacts_dir = tmp_path / "workspace"
+    artifacts_dir.mkdir()
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    
+    names = ["Zebra", "Apple", "Mango", "Kiwi", "Banana", "Cherry", "Date", "Fig"]
+    contract = {
+        "source_repo_url": "https://github.com/test/repo",
+        "entities": [
+            {"name": name, "fields": [{"name": "title", "type": "string", "required": True, "raw": {"type": "string"}}]}
+            for name in names
+        ],
+    }
+    (artifacts_dir / "ui-contract.json").write_text(json.dumps(contract), encoding="utf-8")
+    
+    mock_job = MagicMock()
+    mock_job.db_stack = "postgres"
+    mock_job.artifacts = {}
+    
+    class MockWorkspace:
+        def __init__(self, root, source_dir, artifacts_dir):
+            self.root = root
+            self.source_dir = source_dir
+            self.artifacts_dir = artifacts_dir
+    
+    result = DomainModelerAgent().run(mock_job, MockWorkspace(tmp_path, source_dir, artifacts_dir))
+    assert result.ok, f"Agent failed: {result.message}"
+    
+    sql = (artifacts_dir / "db-schema.sql").read_text(encoding="utf-8")
+    tables = [line.split()[2] for line in sql.splitlines() if line.startswith("CREATE TABLE")]
+    assert tables == [name.lower() for name in names]
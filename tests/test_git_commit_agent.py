@@ -3,10 +3,9 @@ import os
 import json
 import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock, patch, AsyncMock
-import pytest
+from unittest.mock import MagicMock, patch
 from git import Repo
-from app.agents.git_commit_agent import GitCommitAgent
+from app.agents.git_commit_agent import GitCommitAgent, _link_or_copy
 from app.core.workflow import JobStage
 
 
@@ -94,6 +93,34 @@ def test_get_base_branch_defaults_to_main():
     assert base_branch == "main"
 
 
+def test_get_base_branch_from_ls_remote_is_cached():
+    """Test that the default branch is read from ls-remote and memoized per repo URL."""
+    agent = GitCommitAgent()
+    
+    mock_repo = MagicMock()
+    mock_repo.git.ls_remote.return_value = "ref: refs/heads/develop\tHEAD\nabc123def456\tHEAD"
+    repo_url = "https://github.com/test/ls-remote-repo"
+    
+    with patch.object(agent, "_get_github_token", return_value=None):
+        assert agent._get_base_branch(mock_repo, repo_url) == "develop"
+        # Second lookup must come from the cache, not the remote
+        mock_repo.git.ls_remote.side_effect = Exception("Network error")
+        assert agent._get_base_branch(mock_repo, repo_url) == "develop"
+    
+    mock_repo.git.ls_remote.assert_called_once_with("--symref", "origin", "HEAD")
+
+
+def test_ls_remote_default_branch_empty_remote():
+    """Test that a remote without HEAD (no commits yet) is reported as empty."""
+    agent = GitCommitAgent()
+    
+    mock_git = MagicMock()
+    mock_git.ls_remote.return_value = ""
+    
+    assert agent._ls_remote_default_branch(mock_git, "https://github.com/test/empty") is None
+    mock_git.ls_remote.assert_called_once_with("--symref", "https://github.com/test/empty", "HEAD")
+
+
 def test_generate_pr_body():
     """Test PR body generation includes required fields."""
     agent = GitCommitAgent()
@@ -191,19 +218,18 @@ def test_get_github_token_none():
             assert token is None
 
 
-@pytest.mark.asyncio
-async def test_create_pr_success():
+def test_create_pr_success():
     """Test PR creation via GitHub API (mocked)."""
     agent = GitCommitAgent()
     
-    mock_client = AsyncMock()
-    mock_client.create_pr = AsyncMock(return_value={
+    mock_client = MagicMock()
+    mock_client.create_pr_sync = MagicMock(return_value={
         "html_url": "https://github.com/owner/repo/pull/1",
         "url": "https://api.github.com/repos/owner/repo/pulls/1"
     })
     
     with patch("app.agents.git_commit_agent.GitHubClient", return_value=mock_client):
-        pr_url = await agent._create_pr(
+        pr_url = agent._create_pr(
             github_token="test-token",
             repo_url="https://github.com/owner/repo.git",
             base_branch="main",
@@ -214,8 +240,8 @@ async def test_create_pr_success():
         )
     
     assert pr_url == "https://github.com/owner/repo/pull/1"
-    mock_client.create_pr.assert_called_once()
-    call_args = mock_client.create_pr.call_args
+    mock_client.create_pr_sync.assert_called_once()
+    call_args = mock_client.create_pr_sync.call_args
     assert call_args.kwargs["owner"] == "owner"
     assert call_args.kwargs["repo"] == "repo"
     assert call_args.kwargs["base"] == "main"
@@ -224,16 +250,15 @@ async def test_create_pr_success():
     assert "test/source" in call_args.kwargs["body"]
 
 
-@pytest.mark.asyncio
-async def test_create_pr_failure():
+def test_create_pr_failure():
     """Test PR creation handles errors gracefully."""
     agent = GitCommitAgent()
     
-    mock_client = AsyncMock()
-    mock_client.create_pr = AsyncMock(side_effect=Exception("API Error"))
+    mock_client = MagicMock()
+    mock_client.create_pr_sync = MagicMock(side_effect=Exception("API Error"))
     
     with patch("app.agents.git_commit_agent.GitHubClient", return_value=mock_client):
-        pr_url = await agent._create_pr(
+        pr_url = agent._create_pr(
             github_token="test-token",
             repo_url="https://github.com/owner/repo.git",
             base_branch="main",
@@ -272,6 +297,19 @@ def test_file_copy_plan():
     assert "verification.md" in expected_files
 
 
+def test_link_or_copy_replaces_existing_destination(tmp_path):
+    """Test that artifacts are hard-linked and re-linking over an existing file works."""
+    src = tmp_path / "storage-plan.json"
+    src.write_text("{}", encoding="utf-8")
+    dest = tmp_path / "dest.json"
+    
+    _link_or_copy(src, dest)
+    _link_or_copy(src, dest)
+    
+    assert dest.read_text(encoding="utf-8") == "{}"
+    assert os.path.samefile(src, dest)
+
+
 def test_pr_creation_path_with_token():
     """Test that PR creation path is chosen when GH_TOKEN exists."""
     # This is more of an integration test concept
@@ -0,0 +1,43 @@
+"""Unit tests for the fused placeholder-marker stage."""
+from pathlib import Path
+from app.agents.impl_build import PlaceholderMarkersAgent, VerificationAgent
+from app.core.workflow import JobStage
+
+
+class MockWorkspace:
+    """Mock workspace for testing."""
+    def __init__(self, root: Path):
+        self.root = root
+        self.target_dir = root / "target"
+        self.artifacts_dir = root / "workspace"
+        self.target_dir.mkdir()
+        self.artifacts_dir.mkdir()
+
+
+def test_placeholder_markers_agent_writes_all_markers(tmp_path: Path):
+    """Test that one run writes the async, wiring and verification markers."""
+    ws = MockWorkspace(tmp_path)
+
+    result = PlaceholderMarkersAgent().run(job=None, ws=ws)
+
+    assert result.ok
+    assert result.stage == JobStage.ADD_ASYNC
+    assert result.artifacts_index == {
+        "async_marker": "target/MIGRATION_ASYNC_TODO.md",
+        "wiring_marker": "target/MIGRATION_WIRING_TODO.md",
+        "verification": "workspace/verification.md",
+    }
+    assert (ws.target_dir / "MIGRATION_ASYNC_TODO.md").exists()
+    assert (ws.target_dir / "MIGRATION_WIRING_TODO.md").exists()
+    assert "smoke test endpoints" in (ws.artifacts_dir / "verification.md").read_text(encoding="utf-8")
+
+
+def test_single_marker_agent_keeps_its_stage(tmp_path: Path):
+    """Test that the per-stage agents still write only their own marker."""
+    ws = MockWorkspace(tmp_path)
+
+    result = VerificationAgent().run(job=None, ws=ws)
+
+    assert result.stage == JobStage.VERIFY
+    assert result.message == "Wrote placeholder verification report"
+    assert not (ws.target_dir / "MIGRATION_ASYNC_TODO.md").exists()